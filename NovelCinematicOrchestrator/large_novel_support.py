@@ -7,6 +7,7 @@ Nodes for loading large novels from files and processing them efficiently.
 import json
 import os
 import re
+from operator import itemgetter
 from typing import List, Dict, Tuple, Any, Optional
 
 
@@ -262,7 +263,7 @@ class NovelTextSplitter:
                 "paragraph_count": len(current_chunk)
             })
         
-        total_words = sum(c["word_count"] for c in chunks)
+        total_words = sum(map(itemgetter("word_count"), chunks))
         
         return (
             json.dumps(chunks, ensure_ascii=False, indent=2),
@@ -10,11 +10,102 @@ Version: 1.0.0
 """
 
 import json
+import os
 import re
-import textwrap
 import hashlib
+from itertools import cycle
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple, Optional, Any
 
+from .utils import fast_json_dumps
+
+# ============== Precompiled Patterns ==============
+
+# Capitalized names (potential character names)
+_NAME_RE = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\b')
+
+# Patterns that indicate scene changes, fused into one alternation so the
+# text is scanned once. The lookahead keeps matches zero-width, so a break
+# that overlaps another (e.g. a header right after a *** divider) is still
+# reported. Lookaheads are not supported by RE2, so this stays on `re`.
+_SCENE_BREAK_RE = re.compile('(?=' + '|'.join(f'(?:{p})' for p in (
+    r'\n\s*\*\s*\*\s*\*\s*\n',  # *** dividers
+    r'\n\s*---+\s*\n',           # --- dividers
+    r'\n\s*#{1,3}\s+',           # Markdown headers
+    r'\nChapter\s+\d+',          # Chapter markers
+    r'\nPart\s+\d+',             # Part markers
+    r'\n\s*\d+\.\s+',            # Numbered sections
+    r'\n{3,}',                    # Multiple blank lines
+)) + ')', re.IGNORECASE)
+
+# Visual element keywords (matched against lowercased text)
+_LOCATION_CONTEXT_RE = re.compile(
+    r'\b(?:in|at|inside|outside|near|beside|through)\s+(?:the\s+)?([a-z]+(?:\s+[a-z]+)?)'
+)
+# The keyword lists are disjoint whole words, so one scan with a named
+# group per list finds exactly what separate scans would
+_VISUAL_KEYWORD_RE = re.compile(
+    r'\b(?:'
+    r'(?P<place>forest|city|room|house|castle|village|street|garden|mountain|cave|ocean|beach|desert)'
+    r'|(?P<interior>kitchen|bedroom|hallway|library|tower|dungeon|palace|temple|church|school)'
+    r'|(?P<time_of_day>dawn|sunrise|morning|noon|afternoon|dusk|sunset|evening|night|midnight|twilight)'
+    r'|(?P<atmosphere>dark|bright|gloomy|cheerful|tense|peaceful|chaotic|mysterious|eerie|warm|cold)'
+    r')\b'
+)
+
+# Markdown/formatting cleanup for narration: bold, italic, headers and
+# links in one alternation
+_MD_CLEAN_RE = re.compile(r'\*\*(.+?)\*\*|\*(.+?)\*|#{1,6}\s*|\[(.+?)\]\(.+?\)')
+_MD_CHARS = frozenset('*#[')
+_WS_COLLAPSE_RE = re.compile(r'\s+')
+_MULTINEWLINE_RE = re.compile(r'\n{3,}')
+_MULTISPACE_RE = re.compile(r' {2,}')
+_DIALOGUE_RE = re.compile(r'["""].*?["""]|\'.*?\'')
+
+
+# ============== Summary Banner ==============
+
+# Static rows of the production plan banner; only rows with values are
+# formatted per call
+_SUMMARY_HEADER = (
+    "╔══════════════════════════════════════════════════════════════╗\n"
+    "║              📖 NOVEL CINEMATIC PRODUCTION PLAN              ║\n"
+    "╠══════════════════════════════════════════════════════════════╣\n"
+    "║  📊 CONTENT ANALYSIS                                         ║"
+)
+
+_SUMMARY_VISUAL_HEADER = (
+    "╠══════════════════════════════════════════════════════════════╣\n"
+    "║  🎨 VISUAL SETTINGS                                          ║"
+)
+
+_SUMMARY_AUDIO_HEADER = (
+    "╠══════════════════════════════════════════════════════════════╣\n"
+    "║  🎤 AUDIO SETTINGS                                           ║"
+)
+
+_SUMMARY_VIDEO_HEADER = (
+    "╠══════════════════════════════════════════════════════════════╣\n"
+    "║  🎬 VIDEO SETTINGS                                           ║"
+)
+
+_SUMMARY_FOOTER = (
+    "╚══════════════════════════════════════════════════════════════╝\n"
+    "\n"
+    "✅ Ready for pipeline execution!\n"
+    "Connect outputs to:\n"
+    "  • Image Prompts → Flux/SDXL/SD Sampler\n"
+    "  • Narration → IndexTTS/Voice Clone Node  \n"
+    "  • SFX Cues → MMAudio/StableAudio Node\n"
+    "  • Config → Pipeline Controller"
+)
+
+# Rendered banners keyed by every value shown in them (FIFO, bounded)
+_SUMMARY_CACHE: Dict[tuple, str] = {}
+_SUMMARY_CACHE_SIZE = 32
+
 
 class NovelCinematicOrchestrator:
     """
@@ -100,6 +191,16 @@ class NovelCinematicOrchestrator:
                     "step": 1
                 }),
                 "target_resolution": (["1920x1080", "1280x720", "3840x2160", "1080x1920", "720x1280"],),
+                "compact_json": ("BOOLEAN", {
+                    "default": True,
+                    "label_on": "Compact JSON",
+                    "label_off": "Pretty JSON",
+                    "tooltip": "Compact output is much faster to encode for long novels"
+                }),
+                "parallel_scenes": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "Analyze scenes on a thread pool. Leave off if ComfyUI already runs work in parallel."
+                }),
             }
         }
 
@@ -129,7 +230,7 @@ class NovelCinematicOrchestrator:
     
     # ============== Character & Entity Extraction ==============
     
-    COMMON_WORDS = {
+    COMMON_WORDS = frozenset({
         'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
         'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
         'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
@@ -145,23 +246,23 @@ class NovelCinematicOrchestrator:
         'got', 'took', 'saw', 'put', 'told', 'gave', 'found', 'called',
         'yes', 'no', 'oh', 'ah', 'well', 'please', 'thank', 'thanks',
         'mr', 'mrs', 'ms', 'dr', 'prof', 'sir', 'madam', 'lord', 'lady'
-    }
+    })
+    
+    # Name matches are always Capitalized, so comparing against the
+    # capitalized stop words avoids a str.lower() per match
+    _CAPITALIZED_COMMON_WORDS = frozenset(w.capitalize() for w in COMMON_WORDS)
     
     def _extract_characters(self, text: str) -> List[Dict[str, Any]]:
         """Extract character names and their mention counts from text."""
-        # Pattern for capitalized names (potential character names)
-        name_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\b'
-        
         # Find all potential names
-        matches = re.findall(name_pattern, text)
+        matches = _NAME_RE.findall(text)
         
-        # Count occurrences and filter
-        name_counts = {}
-        for name in matches:
-            name_lower = name.lower()
-            # Skip common words and short names
-            if name_lower not in self.COMMON_WORDS and len(name) > 2:
-                name_counts[name] = name_counts.get(name, 0) + 1
+        # Count occurrences, skipping common words and short names
+        common_words = self._CAPITALIZED_COMMON_WORDS
+        name_counts = Counter(
+            name for name in matches
+            if len(name) > 2 and name not in common_words
+        )
         
         # Filter to names that appear multiple times (likely characters)
         characters = []
@@ -170,7 +271,7 @@ class NovelCinematicOrchestrator:
                 characters.append({
                     "name": name,
                     "mentions": count,
-                    "id": hashlib.md5(name.encode()).hexdigest()[:8]
+                    "id": hashlib.blake2b(name.encode(), digest_size=4).hexdigest()
                 })
         
         return characters[:20]  # Limit to top 20 characters
@@ -179,34 +280,102 @@ class NovelCinematicOrchestrator:
     
     def _detect_scene_breaks(self, text: str) -> List[int]:
         """Detect natural scene breaks in text."""
-        # Patterns that indicate scene changes
-        scene_break_patterns = [
-            r'\n\s*\*\s*\*\s*\*\s*\n',  # *** dividers
-            r'\n\s*---+\s*\n',           # --- dividers
-            r'\n\s*#{1,3}\s+',           # Markdown headers
-            r'\nChapter\s+\d+',          # Chapter markers
-            r'\nPart\s+\d+',             # Part markers
-            r'\n\s*\d+\.\s+',            # Numbered sections
-            r'\n{3,}',                    # Multiple blank lines
-        ]
-        
-        breaks = set()
-        for pattern in scene_break_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                breaks.add(match.start())
-        
-        return sorted(breaks)
+        # Single pass; finditer yields each break position once, in order
+        return [match.start() for match in _SCENE_BREAK_RE.finditer(text)]
+    
+    _sentencizer = None  # Lazily created spaCy pipeline, False if unavailable
+    
+    @classmethod
+    def _get_sentencizer(cls):
+        """Return a sentencizer-only spaCy pipeline, or None without spaCy."""
+        if cls._sentencizer is None:
+            try:
+                import spacy
+                nlp = spacy.blank("en")
+                nlp.add_pipe("sentencizer")
+                cls._sentencizer = nlp
+            except ImportError:
+                cls._sentencizer = False
+        return cls._sentencizer or None
+    
+    def _split_long_paragraphs(self, text: str, paragraphs: List[Tuple[int, str]],
+                               max_chars: int) -> List[Tuple[int, str]]:
+        """
+        Split paragraphs longer than max_chars into sentence groups that fit.
+        Requires spaCy; without it paragraphs are returned unchanged.
+        """
+        nlp = self._get_sentencizer()
+        if nlp is None:
+            return paragraphs
+        
+        long_idx = [i for i, (_, p) in enumerate(paragraphs)
+                    if max_chars < len(p) <= nlp.max_length]
+        docs = nlp.pipe((paragraphs[i][1] for i in long_idx), batch_size=8)
+        
+        pieces_by_idx = {}
+        for i, doc in zip(long_idx, docs):
+            para_start = paragraphs[i][0]
+            pieces = []
+            piece_start = piece_end = None
+            for sent in doc.sents:
+                if piece_start is not None and sent.end_char - piece_start > max_chars:
+                    pieces.append((para_start + piece_start,
+                                   text[para_start + piece_start:para_start + piece_end]))
+                    piece_start = None
+                if piece_start is None:
+                    piece_start = sent.start_char
+                piece_end = sent.end_char
+            if piece_start is not None:
+                pieces.append((para_start + piece_start,
+                               text[para_start + piece_start:para_start + piece_end]))
+            pieces_by_idx[i] = pieces
+        
+        result = []
+        for i, paragraph in enumerate(paragraphs):
+            result.extend(pieces_by_idx.get(i, (paragraph,)))
+        return result
     
     def _chunk_scenes(self, text: str, max_chars: int) -> List[Dict[str, Any]]:
         """
         Split text into scenes with intelligent paragraph analysis.
         Returns scene objects with text and metadata.
         """
+        # Fast path: a single paragraph that fits is one scene, no break
+        # detection or paragraph bookkeeping needed
+        stripped = text.strip()
+        if len(stripped) <= max_chars and "\n\n" not in stripped:
+            if not stripped:
+                return []
+            return [{
+                "text": stripped,
+                "paragraphs": [stripped],
+                "start_idx": 0,
+                "char_count": len(stripped),
+                "para_count": 1,
+                "index": 0,
+                "id": "scene_001"
+            }]
+        
         # First, try to use natural scene breaks
         scene_breaks = self._detect_scene_breaks(text)
         
-        # Split by paragraphs
-        paragraphs = [p.strip() for p in text.split("\n\n") if p.strip()]
+        # Split by paragraphs, recording where each one starts in the text
+        paragraphs = []
+        text_len = len(text)
+        cursor = 0
+        while cursor <= text_len:
+            end = text.find("\n\n", cursor)
+            if end == -1:
+                end = text_len
+            chunk = text[cursor:end]
+            paragraph = chunk.strip()
+            if paragraph:
+                paragraphs.append((cursor + len(chunk) - len(chunk.lstrip()), paragraph))
+            cursor = end + 2
+        
+        # Paragraphs longer than a scene are split at sentence boundaries
+        if any(len(paragraph) > max_chars for _, paragraph in paragraphs):
+            paragraphs = self._split_long_paragraphs(text, paragraphs, max_chars)
         
         scenes = []
         current_scene = {
@@ -215,20 +384,19 @@ class NovelCinematicOrchestrator:
             "start_idx": 0
         }
         current_len = 0
+        num_breaks = len(scene_breaks)
         
-        for i, paragraph in enumerate(paragraphs):
+        for para_start, paragraph in paragraphs:
             para_len = len(paragraph)
             
             # Check if we should start a new scene
             should_break = False
             
-            # Check if this paragraph starts after a scene break
-            if scene_breaks:
-                para_start = text.find(paragraph)
-                for break_pos in scene_breaks:
-                    if para_start > break_pos and break_pos > current_scene["start_idx"]:
-                        should_break = True
-                        break
+            # Check if a scene break lies between the scene start and this paragraph
+            if num_breaks:
+                next_break = bisect_right(scene_breaks, current_scene["start_idx"])
+                if next_break < num_breaks and scene_breaks[next_break] < para_start:
+                    should_break = True
             
             # Check if adding this paragraph exceeds max_chars
             if current_len + para_len + 2 > max_chars and current_scene["text"]:
@@ -244,7 +412,7 @@ class NovelCinematicOrchestrator:
                 current_scene = {
                     "text": paragraph,
                     "paragraphs": [paragraph],
-                    "start_idx": text.find(paragraph) if paragraph in text else 0
+                    "start_idx": para_start
                 }
                 current_len = para_len
             else:
@@ -288,95 +456,93 @@ class NovelCinematicOrchestrator:
         "pixart": "high quality artwork, detailed, aesthetic, professional"
     }
     
-    def _extract_visual_elements(self, text: str) -> Dict[str, List[str]]:
-        """Extract visual elements (locations, objects, actions) from text."""
+    # Shot types cycled through for each scene's B-roll
+    SHOT_TYPES = ("establishing shot", "medium shot", "close-up", "wide shot",
+                  "over-the-shoulder", "POV shot", "detail shot", "reaction shot")
+    
+    def _extract_visual_elements(self, text: str,
+                                 text_lower: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Extract visual elements (locations, objects, actions) from text.
+        Pass text_lower if the caller already has a lowercased copy.
+        """
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        # Keyword matches bucketed by list in a single pass. Dicts act as
+        # ordered sets, so duplicates are dropped as they are found.
+        keywords = {"place": {}, "interior": {}, "time_of_day": {}, "atmosphere": {}}
+        for match in _VISUAL_KEYWORD_RE.finditer(text_lower):
+            keywords[match.lastgroup][match.group(match.lastgroup)] = None
+        
+        # Locations: prepositional context first, then place keywords
+        locations = dict.fromkeys(_LOCATION_CONTEXT_RE.findall(text_lower))
+        locations.update(keywords["place"])
+        locations.update(keywords["interior"])
+        
         elements = {
-            "locations": [],
+            "locations": list(locations),
             "objects": [],
             "actions": [],
-            "atmosphere": [],
-            "time_of_day": []
+            "atmosphere": list(keywords["atmosphere"]),
+            "time_of_day": list(keywords["time_of_day"])
         }
         
-        # Location keywords
-        location_patterns = [
-            r'\b(?:in|at|inside|outside|near|beside|through)\s+(?:the\s+)?([a-z]+(?:\s+[a-z]+)?)',
-            r'\b(forest|city|room|house|castle|village|street|garden|mountain|cave|ocean|beach|desert)\b',
-            r'\b(kitchen|bedroom|hallway|library|tower|dungeon|palace|temple|church|school)\b'
-        ]
-        
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text.lower())
-            elements["locations"].extend(matches if isinstance(matches[0] if matches else '', str) else [m for m in matches])
-        
-        # Time of day
-        time_patterns = [
-            r'\b(dawn|sunrise|morning|noon|afternoon|dusk|sunset|evening|night|midnight|twilight)\b'
-        ]
-        for pattern in time_patterns:
-            elements["time_of_day"].extend(re.findall(pattern, text.lower()))
-        
-        # Atmosphere
-        atmosphere_patterns = [
-            r'\b(dark|bright|gloomy|cheerful|tense|peaceful|chaotic|mysterious|eerie|warm|cold)\b'
-        ]
-        for pattern in atmosphere_patterns:
-            elements["atmosphere"].extend(re.findall(pattern, text.lower()))
-        
-        # Remove duplicates while preserving order
-        for key in elements:
-            elements[key] = list(dict.fromkeys(elements[key]))
-        
         return elements
     
     def _generate_image_prompts(self, scene: Dict, scene_idx: int, 
-                                  broll_density: int, style: str, 
-                                  engine: str, custom_style: str,
-                                  characters: List[Dict]) -> List[Dict[str, Any]]:
-        """Generate detailed image prompts for a scene."""
+                                  broll_density: int, style_mod: str, 
+                                  quality_mod: str, custom_style: str,
+                                  characters: List[Dict],
+                                  text_lower: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Generate detailed image prompts for a scene.
+        style_mod and quality_mod are the resolved style/engine modifiers.
+        """
         text = scene["text"]
+        if text_lower is None:
+            text_lower = text.lower()
         
         # Extract visual elements
-        visual_elements = self._extract_visual_elements(text)
-        
-        # Get style and quality modifiers
-        style_mod = self.STYLE_TEMPLATES.get(style, self.STYLE_TEMPLATES["cinematic"])
-        quality_mod = self.ENGINE_QUALITY.get(engine, self.ENGINE_QUALITY["flux"])
+        visual_elements = self._extract_visual_elements(text, text_lower)
         
         # Split scene into chunks for different shots
-        flat_text = " ".join(text.replace("\n", " ").split())
+        flat_text = _WS_COLLAPSE_RE.sub(' ', text).strip()
         chunk_size = max(len(flat_text) // max(broll_density, 1), 50)
+        snippets = [flat_text[i * chunk_size:(i + 1) * chunk_size] for i in range(broll_density)]
+        
+        # Per-scene prompt parts shared by every shot
+        locations = visual_elements["locations"]
+        num_locations = len(locations)
+        lighting = visual_elements["time_of_day"][0] + " lighting" if visual_elements["time_of_day"] else None
+        atmosphere = visual_elements["atmosphere"][0] + " atmosphere" if visual_elements["atmosphere"] else None
+        
+        # Characters present in this scene (same for every shot)
+        scene_characters = [c["name"] for c in characters if c["name"].lower() in text_lower][:3]
         
         prompts = []
         
-        for i in range(broll_density):
-            start = i * chunk_size
-            snippet = flat_text[start:start + chunk_size]
-            
+        # Shot type is determined by position
+        for i, (snippet, shot_type) in enumerate(zip(snippets, cycle(self.SHOT_TYPES))):
             if not snippet:
                 continue
             
-            # Determine shot type based on position
-            shot_types = ["establishing shot", "medium shot", "close-up", "wide shot", 
-                         "over-the-shoulder", "POV shot", "detail shot", "reaction shot"]
-            shot_type = shot_types[i % len(shot_types)]
-            
             # Build prompt components
             components = []
             
             # Shot info
             components.append(f"Scene {scene_idx + 1}, Shot {i + 1}, {shot_type}")
             
-            # Location context
-            if visual_elements["locations"]:
-                loc = visual_elements["locations"][i % len(visual_elements["locations"])] if i < len(visual_elements["locations"]) else visual_elements["locations"][0]
+            # Location context: one per shot, then the primary location
+            if num_locations:
+                loc = locations[i] if i < num_locations else locations[0]
                 components.append(f"setting: {loc}")
             
             # Time/atmosphere
-            if visual_elements["time_of_day"]:
-                components.append(visual_elements["time_of_day"][0] + " lighting")
-            if visual_elements["atmosphere"]:
-                components.append(visual_elements["atmosphere"][0] + " atmosphere")
+            if lighting:
+                components.append(lighting)
+            if atmosphere:
+                components.append(atmosphere)
             
             # Content from text
             # Extract key phrases (simplified - in production, use NLP)
@@ -385,7 +551,6 @@ class NovelCinematicOrchestrator:
                 components.append(f"depicting: {key_phrase}")
             
             # Character reference if available
-            scene_characters = [c["name"] for c in characters if c["name"].lower() in text.lower()][:3]
             if scene_characters:
                 components.append(f"featuring: {', '.join(scene_characters)}")
             
@@ -412,28 +577,42 @@ class NovelCinematicOrchestrator:
     
     # ============== Narration Processing ==============
     
+    @staticmethod
+    def _strip_markdown(text: str) -> str:
+        """
+        Remove bold/italic/header/link markup in fused passes.
+        A pass is repeated only while markup characters remain and it still
+        changes something, so nested markup like ***bold italic*** is cleaned.
+        """
+        while not _MD_CHARS.isdisjoint(text):
+            cleaned = _MD_CLEAN_RE.sub(
+                lambda m: m.group(1) or m.group(2) or m.group(3) or "", text
+            )
+            if cleaned == text:
+                break
+            text = cleaned
+        return text
+    
     def _process_narration(self, scene_text: str, scene_idx: int) -> Dict[str, Any]:
         """Process scene text into narration-ready format."""
         # Clean up the text for TTS
         narration = scene_text.strip()
         
-        # Remove markdown/formatting artifacts
-        narration = re.sub(r'\*\*(.+?)\*\*', r'\1', narration)  # Bold
-        narration = re.sub(r'\*(.+?)\*', r'\1', narration)      # Italic
-        narration = re.sub(r'#{1,6}\s*', '', narration)          # Headers
-        narration = re.sub(r'\[(.+?)\]\(.+?\)', r'\1', narration)  # Links
+        # Remove markdown/formatting artifacts (no-op for plain text)
+        narration = self._strip_markdown(narration)
         
         # Normalize whitespace
-        narration = re.sub(r'\n{3,}', '\n\n', narration)
-        narration = re.sub(r' {2,}', ' ', narration)
+        if '\n\n\n' in narration:
+            narration = _MULTINEWLINE_RE.sub('\n\n', narration)
+        if '  ' in narration:
+            narration = _MULTISPACE_RE.sub(' ', narration)
         
         # Estimate duration (average reading speed: ~150 words per minute)
         word_count = len(narration.split())
         estimated_duration_seconds = (word_count / 150) * 60
         
         # Detect dialogue vs narration ratio
-        dialogue_pattern = r'["""].*?["""]|\'.*?\''
-        dialogue_matches = re.findall(dialogue_pattern, narration)
+        dialogue_matches = _DIALOGUE_RE.findall(narration)
         dialogue_word_count = sum(len(d.split()) for d in dialogue_matches)
         dialogue_ratio = dialogue_word_count / max(word_count, 1)
         
@@ -499,17 +678,45 @@ class NovelCinematicOrchestrator:
         "dusk": ["evening ambience, sunset sounds"]
     }
     
-    def _generate_sfx_cues(self, scene_text: str, scene_idx: int) -> Dict[str, Any]:
+    SFX_CATEGORIES = {
+        "weather": ["rain", "storm", "thunder", "wind", "snow"],
+        "nature": ["forest", "ocean", "river", "bird", "wolf"],
+        "urban": ["city", "crowd", "market", "traffic"],
+        "action": ["battle", "fight", "sword", "gun", "explosion", "running", "chase"],
+        "interior": ["fire", "door", "footsteps", "clock"],
+        "emotional": ["crying", "laughing", "scream", "whisper"],
+        "time": ["morning", "night", "dawn", "dusk"]
+    }
+    
+    # Keyword -> category, built once at class load
+    _SFX_KEYWORD_CATEGORY = {
+        keyword: cat for cat, keywords in SFX_CATEGORIES.items() for keyword in keywords
+    }
+    
+    # All SFX keywords in one pattern. The lookahead makes every match
+    # zero-width so keywords inside other keywords ("storm" in
+    # "thunderstorm") are still counted, matching substring semantics.
+    _SFX_KEYWORD_RE = re.compile(
+        '(?=(' + '|'.join(sorted(map(re.escape, SFX_KEYWORDS), key=len, reverse=True)) + '))'
+    )
+    
+    def _generate_sfx_cues(self, scene_text: str, scene_idx: int,
+                           text_lower: Optional[str] = None) -> Dict[str, Any]:
         """Generate SFX cues based on scene content analysis."""
-        text_lower = scene_text.lower()
+        if text_lower is None:
+            text_lower = scene_text.lower()
+        
+        # Count every keyword occurrence in a single pass
+        keyword_counts = {}
+        for keyword in self._SFX_KEYWORD_RE.findall(text_lower):
+            keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
         
         detected_cues = []
         cue_categories = {}
         
         for keyword, sfx_options in self.SFX_KEYWORDS.items():
-            if keyword in text_lower:
-                # Count occurrences for priority
-                count = text_lower.count(keyword)
+            count = keyword_counts.get(keyword)
+            if count:
                 category = self._categorize_sfx(keyword)
                 
                 if category not in cue_categories:
@@ -550,23 +757,32 @@ class NovelCinematicOrchestrator:
     
     def _categorize_sfx(self, keyword: str) -> str:
         """Categorize SFX keyword."""
-        categories = {
-            "weather": ["rain", "storm", "thunder", "wind", "snow"],
-            "nature": ["forest", "ocean", "river", "bird", "wolf"],
-            "urban": ["city", "crowd", "market", "traffic"],
-            "action": ["battle", "fight", "sword", "gun", "explosion", "running", "chase"],
-            "interior": ["fire", "door", "footsteps", "clock"],
-            "emotional": ["crying", "laughing", "scream", "whisper"],
-            "time": ["morning", "night", "dawn", "dusk"]
-        }
-        
-        for cat, keywords in categories.items():
-            if keyword in keywords:
-                return cat
-        return "other"
+        return self._SFX_KEYWORD_CATEGORY.get(keyword, "other")
     
     # ============== Main Processing Function ==============
     
+    def _analyze_scene(self, scene: Dict, idx: int, broll_density: int,
+                       style_mod: str, quality_mod: str, custom_style: str,
+                       characters: List[Dict]) -> Tuple[List[Dict], Dict, Dict]:
+        """Generate image prompts, narration and SFX cues for one scene."""
+        # Lowercased text is shared by the prompt and SFX analysis
+        scene_text_lower = scene["text"].lower()
+        
+        # Generate image prompts
+        scene_prompts = self._generate_image_prompts(
+            scene, idx, broll_density, style_mod, 
+            quality_mod, custom_style, characters,
+            scene_text_lower
+        )
+        
+        # Process narration
+        narration = self._process_narration(scene["text"], idx)
+        
+        # Generate SFX cues
+        sfx = self._generate_sfx_cues(scene["text"], idx, scene_text_lower)
+        
+        return scene_prompts, narration, sfx
+    
     def process_novel(
         self,
         novel_text: str,
@@ -583,7 +799,9 @@ class NovelCinematicOrchestrator:
         custom_style_prompt: str = "",
         scene_transition_style: str = "fade",
         target_video_fps: int = 24,
-        target_resolution: str = "1920x1080"
+        target_resolution: str = "1920x1080",
+        compact_json: bool = True,
+        parallel_scenes: bool = False
     ) -> Tuple[str, str, str, str, str, str, str]:
         """
         Main processing function that orchestrates the entire novel analysis.
@@ -601,35 +819,46 @@ class NovelCinematicOrchestrator:
         # 2. Split novel into scenes
         scenes = self._chunk_scenes(novel_text, max_scene_chars)
         
-        # 3. Process each scene
-        all_scenes = []
-        all_image_prompts = []
-        all_narration = []
-        all_sfx_cues = []
+        # 3. Process each scene (results are slotted in by scene index)
+        num_scenes = len(scenes)
+        all_scenes = [None] * num_scenes
+        all_image_prompts = [None] * num_scenes
+        all_narration = [None] * num_scenes
+        all_sfx_cues = [None] * num_scenes
         
         total_duration = 0
         total_shots = 0
         
-        for idx, scene in enumerate(scenes):
-            # Generate image prompts
-            scene_prompts = self._generate_image_prompts(
-                scene, idx, broll_density, image_style, 
-                image_engine, custom_style_prompt, characters
+        # Resolve style and quality modifiers once for all scenes
+        style_mod = self.STYLE_TEMPLATES.get(image_style, self.STYLE_TEMPLATES["cinematic"])
+        quality_mod = self.ENGINE_QUALITY.get(image_engine, self.ENGINE_QUALITY["flux"])
+        
+        def analyze(idx_scene):
+            idx, scene = idx_scene
+            return self._analyze_scene(
+                scene, idx, broll_density, style_mod,
+                quality_mod, custom_style_prompt, characters
             )
-            all_image_prompts.append(scene_prompts)
+        
+        # Scenes are independent, so they can be analyzed concurrently;
+        # map() keeps results in scene order either way
+        if parallel_scenes and num_scenes > 1:
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                results = list(executor.map(analyze, enumerate(scenes)))
+        else:
+            results = map(analyze, enumerate(scenes))
+        
+        for idx, (scene, (scene_prompts, narration, sfx)) in enumerate(zip(scenes, results)):
+            all_image_prompts[idx] = scene_prompts
             total_shots += len(scene_prompts)
             
-            # Process narration
-            narration = self._process_narration(scene["text"], idx)
-            all_narration.append(narration)
+            all_narration[idx] = narration
             total_duration += narration["estimated_duration_seconds"]
             
-            # Generate SFX cues
-            sfx = self._generate_sfx_cues(scene["text"], idx)
-            all_sfx_cues.append(sfx)
+            all_sfx_cues[idx] = sfx
             
             # Store scene metadata
-            all_scenes.append({
+            all_scenes[idx] = {
                 "id": scene["id"],
                 "index": idx,
                 "text": scene["text"],
@@ -637,7 +866,7 @@ class NovelCinematicOrchestrator:
                 "para_count": scene.get("para_count", 1),
                 "shot_count": len(scene_prompts),
                 "duration_estimate": narration["estimated_duration_seconds"]
-            })
+            }
         
         # 4. Build configuration object
         config = {
@@ -648,7 +877,7 @@ class NovelCinematicOrchestrator:
             "parallax_enabled": parallax_enabled,
             "sfx_mode": sfx_mode,
             "broll_density": broll_density,
-            "num_scenes": len(scenes),
+            "num_scenes": num_scenes,
             "total_shots": total_shots,
             "estimated_duration_seconds": round(total_duration, 1),
             "estimated_duration_formatted": self._format_duration(total_duration),
@@ -662,20 +891,21 @@ class NovelCinematicOrchestrator:
         
         # 5. Generate summary
         summary = self._generate_summary(
-            len(scenes), total_shots, total_duration, 
+            num_scenes, total_shots, total_duration, 
             len(characters), config
         )
         
         # 6. JSON encode everything
-        scenes_json = json.dumps(
+        pretty = not compact_json
+        scenes_json = fast_json_dumps(
             [{"id": s["id"], "index": s["index"], "text": s["text"]} for s in all_scenes],
-            ensure_ascii=False, indent=2
+            pretty
         )
-        image_prompts_json = json.dumps(all_image_prompts, ensure_ascii=False, indent=2)
-        narration_json = json.dumps(all_narration, ensure_ascii=False, indent=2)
-        sfx_json = json.dumps(all_sfx_cues, ensure_ascii=False, indent=2)
-        characters_json = json.dumps(characters, ensure_ascii=False, indent=2)
-        config_json = json.dumps(config, ensure_ascii=False, indent=2)
+        image_prompts_json = fast_json_dumps(all_image_prompts, pretty)
+        narration_json = fast_json_dumps(all_narration, pretty)
+        sfx_json = fast_json_dumps(all_sfx_cues, pretty)
+        characters_json = fast_json_dumps(characters, pretty)
+        config_json = fast_json_dumps(config, pretty)
         
         return (
             scenes_json,
@@ -701,40 +931,53 @@ class NovelCinematicOrchestrator:
                           duration: float, num_characters: int,
                           config: Dict) -> str:
         """Generate a human-readable summary of the production plan."""
-        duration_str = self._format_duration(duration)
+        cache_key = (
+            num_scenes, num_shots, duration, num_characters,
+            config['image_engine'], config['image_style'], config['target_resolution'],
+            config['parallax_enabled'], config['voice_mode'], config['sfx_mode'],
+            config['has_voice_reference'], config['target_video_fps'],
+            config['scene_transition_style'], config['broll_density']
+        )
+        cached = _SUMMARY_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
         
-        summary = f"""
-╔══════════════════════════════════════════════════════════════╗
-║              📖 NOVEL CINEMATIC PRODUCTION PLAN              ║
-╠══════════════════════════════════════════════════════════════╣
-║  📊 CONTENT ANALYSIS                                         ║
-║  ├─ Scenes: {num_scenes:>4}                                          ║
-║  ├─ Total Shots: {num_shots:>4}                                      ║
-║  ├─ Characters Detected: {num_characters:>4}                               ║
-║  └─ Estimated Duration: {duration_str:>10}                       ║
-╠══════════════════════════════════════════════════════════════╣
-║  🎨 VISUAL SETTINGS                                          ║
-║  ├─ Image Engine: {config['image_engine']:<15}                       ║
-║  ├─ Style: {config['image_style']:<20}                        ║
-║  ├─ Resolution: {config['target_resolution']:<15}                    ║
-║  └─ 3D Parallax: {'Enabled' if config['parallax_enabled'] else 'Disabled':<15}                       ║
-╠══════════════════════════════════════════════════════════════╣
-║  🎤 AUDIO SETTINGS                                           ║
-║  ├─ Voice Mode: {config['voice_mode']:<20}                    ║
-║  ├─ SFX Mode: {config['sfx_mode']:<20}                        ║
-║  └─ Voice Reference: {'Yes' if config['has_voice_reference'] else 'No':<10}                       ║
-╠══════════════════════════════════════════════════════════════╣
-║  🎬 VIDEO SETTINGS                                           ║
-║  ├─ FPS: {config['target_video_fps']:>3}                                             ║
-║  ├─ Transitions: {config['scene_transition_style']:<15}                      ║
-║  └─ B-Roll Density: {config['broll_density']:>2} shots/scene                       ║
-╚══════════════════════════════════════════════════════════════╝
-
-✅ Ready for pipeline execution!
-Connect outputs to:
-  • Image Prompts → Flux/SDXL/SD Sampler
-  • Narration → IndexTTS/Voice Clone Node  
-  • SFX Cues → MMAudio/StableAudio Node
-  • Config → Pipeline Controller
-"""
-        return summary.strip()
+        duration_str = self._format_duration(duration)
+        image_engine = config['image_engine']
+        image_style = config['image_style']
+        resolution = config['target_resolution']
+        parallax = 'Enabled' if config['parallax_enabled'] else 'Disabled'
+        voice_mode = config['voice_mode']
+        sfx_mode = config['sfx_mode']
+        voice_ref = 'Yes' if config['has_voice_reference'] else 'No'
+        fps = config['target_video_fps']
+        transitions = config['scene_transition_style']
+        broll_density = config['broll_density']
+        
+        # The parts have no leading/trailing whitespace, so no strip() needed
+        summary = "\n".join((
+            _SUMMARY_HEADER,
+            f"║  ├─ Scenes: {num_scenes:>4}                                          ║",
+            f"║  ├─ Total Shots: {num_shots:>4}                                      ║",
+            f"║  ├─ Characters Detected: {num_characters:>4}                               ║",
+            f"║  └─ Estimated Duration: {duration_str:>10}                       ║",
+            _SUMMARY_VISUAL_HEADER,
+            f"║  ├─ Image Engine: {image_engine:<15}                       ║",
+            f"║  ├─ Style: {image_style:<20}                        ║",
+            f"║  ├─ Resolution: {resolution:<15}                    ║",
+            f"║  └─ 3D Parallax: {parallax:<15}                       ║",
+            _SUMMARY_AUDIO_HEADER,
+            f"║  ├─ Voice Mode: {voice_mode:<20}                    ║",
+            f"║  ├─ SFX Mode: {sfx_mode:<20}                        ║",
+            f"║  └─ Voice Reference: {voice_ref:<10}                       ║",
+            _SUMMARY_VIDEO_HEADER,
+            f"║  ├─ FPS: {fps:>3}                                             ║",
+            f"║  ├─ Transitions: {transitions:<15}                      ║",
+            f"║  └─ B-Roll Density: {broll_density:>2} shots/scene                       ║",
+            _SUMMARY_FOOTER,
+        ))
+        
+        if len(_SUMMARY_CACHE) >= _SUMMARY_CACHE_SIZE:
+            _SUMMARY_CACHE.pop(next(iter(_SUMMARY_CACHE)))
+        _SUMMARY_CACHE[cache_key] = summary
+        return summary
@@ -13,9 +13,138 @@ Supports:
 """
 
 import json
+import mmap
+import os
 import re
-import math
-from typing import List, Dict, Tuple, Any, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+from typing import List, Dict, Iterable, Tuple, Any, Optional
+
+from .utils import _normalize_quotes, fast_json_dumps, fast_json_loads
+
+# Optional: ijson lets very large chunk files be read into a ChunkTable
+# without first materialising one dict per chunk.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Chunk files larger than this (in bytes) are stream-parsed when ijson is available
+_STREAM_PARSE_THRESHOLD = 8 * 1024 * 1024
+
+# Seconds of speech per character (~15 chars/sec at 150 WPM)
+_INV_CPS = 1.0 / 15.0
+
+
+# Patterns used by the chunker and dialogue splitter, compiled once
+_MD_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_MD_ITALIC = re.compile(r'\*(.+?)\*')
+_MD_UND = re.compile(r'_(.+?)_')
+_MD_HEAD = re.compile(r'#{1,6}\s*')
+_MULTINEWLINE = re.compile(r'\n{3,}')
+_MULTISPACE = re.compile(r' {2,}')
+_SENT_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Separator levels tried in order when text is too long for one TTS chunk:
+# (pattern, joiner used when pieces are packed back together)
+_PARAGRAPH_LEVEL = (re.compile(r'\n\n'), "\n\n")
+_SPLIT_LEVELS = (
+    (_SENT_SPLIT, " "),
+    (re.compile(r'(?<=[,;:])\s+'), " "),
+    (re.compile(r'\s+'), " "),
+)
+
+# Quoted dialogue with optional speaker attribution, matched in one pass:
+# Character said, "dialogue" / "dialogue," said Character / "dialogue," Character said
+# The trailing attribution is a lookahead so it stays available as narration.
+_DIALOGUE_RE = re.compile(
+    r'(?:\b(?P<pre>[A-Z][a-z]+)\s+said[,:]?\s*)?'
+    r'"(?P<quote>[^"]+)"'
+    r'(?:(?=\s*(?:said\s+(?P<post>[A-Z][a-z]+)\b|(?P<post_rev>[A-Z][a-z]+)\s+said\b)))?'
+)
+
+
+class ChunkTable:
+    """
+    Column-wise copy of a TTS chunk list.
+    
+    The iterator/batch/assembly/queue nodes only read a few fields per chunk,
+    so they are kept as parallel tuples instead of one dict per chunk, and
+    batches are plain slices of the columns.
+    """
+    
+    def __init__(self, chunks: Iterable[Dict]):
+        texts, ids, indices, scene_idx, seconds, scene_end = [], [], [], [], [], []
+        for i, c in enumerate(chunks):
+            texts.append(c.get("text", ""))
+            ids.append(c.get("id", f"chunk_{i}"))
+            indices.append(c.get("index", 0))
+            scene_idx.append(c.get("scene_idx", 0))
+            seconds.append(c.get("estimated_seconds", 0.0))
+            scene_end.append(c.get("is_scene_end", False))
+        
+        self.texts = tuple(texts)
+        self.ids = tuple(ids)
+        self.indices = tuple(indices)
+        self.scene_idx = tuple(scene_idx)
+        self.seconds = tuple(seconds)
+        self.scene_end = tuple(scene_end)
+        self._index_counts = None
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    @property
+    def index_counts(self) -> Counter:
+        """How many chunks carry each index (built on first use)."""
+        if self._index_counts is None:
+            self._index_counts = Counter(self.indices)
+        return self._index_counts
+
+
+@lru_cache(maxsize=8)
+def _parse_chunk_table(tts_chunks_json: str) -> ChunkTable:
+    """
+    Parse a TTS chunks JSON string into a ChunkTable.
+    
+    The chunk nodes are driven in a loop over the same chunk list, so
+    recently seen inputs are kept parsed. The table is shared between calls.
+    The string is already in memory, so it is parsed in one go; only chunk
+    files are streamed (see _load_chunk_table_file).
+    """
+    return ChunkTable(fast_json_loads(tts_chunks_json))
+
+
+@lru_cache(maxsize=4)
+def _load_chunk_table_file(path: str, mtime_ns: int, size: int) -> ChunkTable:
+    """
+    Load a TTS chunks JSON file into a ChunkTable through a read-only mmap.
+    
+    The parser reads straight from the mapped pages, so the file is never
+    decoded into a Python string. mtime_ns and size are part of the cache
+    key so a rewritten file is loaded again.
+    """
+    if size == 0:
+        raise json.JSONDecodeError("Empty chunks file", "", 0)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if ijson is not None and size > _STREAM_PARSE_THRESHOLD:
+            try:
+                return ChunkTable(ijson.items(mm, "item", use_float=True))
+            except ijson.JSONError as e:
+                raise json.JSONDecodeError(str(e), "", 0)
+        view = memoryview(mm)
+        try:
+            return ChunkTable(fast_json_loads(view))
+        finally:
+            view.release()
+
+
+@lru_cache(maxsize=8)
+def _parse_completed(completed_indices: str) -> frozenset:
+    """Parse a JSON array of completed chunk indices into a set."""
+    return frozenset(fast_json_loads(completed_indices))
 
 
 class TTSCoverageCalculator:
@@ -52,6 +181,16 @@ class TTSCoverageCalculator:
         "voxcpm": 1000,
         "kokoro": 2000,
     }
+    
+    # Approximate VRAM per TTS instance (GB)
+    TTS_VRAM_GB = {
+        "index_tts": 4,
+        "index_tts_2": 4,
+        "xtts": 6,
+        "chatterbox": 3,
+        "voxcpm": 5,
+        "kokoro": 2,
+    }
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -90,9 +229,13 @@ class TTSCoverageCalculator:
     FUNCTION = "calculate_tts"
     CATEGORY = "🎬 Story Tools/TTS"
 
-    def calculate_tts(self, word_count: int, tts_engine: str,
+    @classmethod
+    @lru_cache(maxsize=64)
+    def calculate_tts(cls, word_count: int, tts_engine: str,
                       narration_speed_wpm: int, 
                       parallel_instances: int) -> Tuple[str, int, float, float, int, str]:
+        # Pure function of its inputs; cached since the node re-runs on
+        # every graph execution
         
         # Calculate audio duration
         audio_minutes = word_count / narration_speed_wpm
@@ -103,11 +246,11 @@ class TTSCoverageCalculator:
         total_chars = word_count * 6
         
         # Get engine specs
-        max_chars = self.TTS_MAX_CHARS.get(tts_engine, 1000)
-        gen_speed = self.TTS_SPEEDS.get(tts_engine, 50)
+        max_chars = cls.TTS_MAX_CHARS.get(tts_engine, 1000)
+        gen_speed = cls.TTS_SPEEDS.get(tts_engine, 50)
         
         # Calculate chunks needed
-        chunks_needed = math.ceil(total_chars / max_chars)
+        chunks_needed = -(-total_chars // max_chars)
         
         # Calculate generation time
         # Time = total_chars / gen_speed / parallel_instances
@@ -118,19 +261,10 @@ class TTSCoverageCalculator:
         rtf = gen_seconds / audio_seconds if audio_seconds > 0 else 0
         
         # VRAM estimate per instance
-        vram_estimates = {
-            "index_tts": 4,
-            "index_tts_2": 4,
-            "xtts": 6,
-            "chatterbox": 3,
-            "voxcpm": 5,
-            "kokoro": 2,
-        }
-        vram_per = vram_estimates.get(tts_engine, 4)
+        vram_per = cls.TTS_VRAM_GB.get(tts_engine, 4)
         total_vram = vram_per * parallel_instances
         
-        analysis = f"""
-╔══════════════════════════════════════════════════════════════════╗
+        analysis = f"""╔══════════════════════════════════════════════════════════════════╗
 ║                   🎤 TTS GENERATION ANALYSIS                      ║
 ╠══════════════════════════════════════════════════════════════════╣
 ║  📖 NOVEL STATS                                                   ║
@@ -157,8 +291,7 @@ class TTSCoverageCalculator:
 ║  ├─ Chunk Size:           {max_chars:>12} chars                     ║
 ║  ├─ Process in Batches:   {min(50, chunks_needed):>12} at a time                ║
 ║  └─ Save Checkpoints:     Every {max(1, chunks_needed // 10):>6} chunks                  ║
-╚══════════════════════════════════════════════════════════════════╝
-"""
+╚══════════════════════════════════════════════════════════════════╝"""
         
         settings = {
             "tts_engine": tts_engine,
@@ -174,12 +307,12 @@ class TTSCoverageCalculator:
         }
         
         return (
-            analysis.strip(),
+            analysis,
             chunks_needed,
             round(audio_hours, 2),
             round(gen_hours, 2),
             max_chars,
-            json.dumps(settings, indent=2)
+            fast_json_dumps(settings, pretty=True)
         )
 
 
@@ -227,6 +360,10 @@ class NarrationToTTSChunks:
                     "default": True,
                     "tooltip": "Add pause markers between sections"
                 }),
+                "parallel_scenes": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "Chunk scenes on a thread pool. Leave off if ComfyUI already runs work in parallel."
+                }),
             }
         }
 
@@ -237,88 +374,46 @@ class NarrationToTTSChunks:
 
     def create_chunks(self, narration_json: str, max_chars_per_chunk: int,
                       overlap_words: int, preserve_paragraphs: bool,
-                      add_pauses: bool = True) -> Tuple[str, int, float, str]:
+                      add_pauses: bool = True,
+                      parallel_scenes: bool = False) -> Tuple[str, int, float, str]:
         
         try:
-            narrations = json.loads(narration_json)
+            narrations = fast_json_loads(narration_json)
         except json.JSONDecodeError:
             return ("[]", 0, 0.0, "Error: Invalid JSON")
         
+        if preserve_paragraphs:
+            levels = (_PARAGRAPH_LEVEL,) + _SPLIT_LEVELS
+        else:
+            levels = _SPLIT_LEVELS
+        
+        def chunk_scene(narration: Dict) -> List[str]:
+            return self._chunk_scene(narration.get("text", ""), max_chars_per_chunk, levels)
+        
+        # Scenes are chunked independently; numbering happens afterwards
+        if parallel_scenes and len(narrations) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                scene_texts = list(executor.map(chunk_scene, narrations))
+        else:
+            scene_texts = map(chunk_scene, narrations)
+        
         all_chunks = []
         chunk_idx = 0
-        
-        for scene_idx, narration in enumerate(narrations):
-            text = narration.get("text", "")
-            if not text:
-                continue
-            
-            # Clean text for TTS
-            text = self._clean_for_tts(text)
-            
-            # Split into chunks
-            if preserve_paragraphs:
-                paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-            else:
-                paragraphs = [text]
-            
-            current_chunk = ""
-            
-            for para in paragraphs:
-                # If paragraph fits, add it
-                if len(current_chunk) + len(para) + 2 <= max_chars_per_chunk:
-                    if current_chunk:
-                        current_chunk += "\n\n" + para
-                    else:
-                        current_chunk = para
-                else:
-                    # Save current chunk if exists
-                    if current_chunk:
-                        all_chunks.append(self._create_chunk_obj(
-                            current_chunk, chunk_idx, scene_idx, add_pauses
-                        ))
-                        chunk_idx += 1
-                    
-                    # Handle long paragraph - split by sentences
-                    if len(para) > max_chars_per_chunk:
-                        sentences = re.split(r'(?<=[.!?])\s+', para)
-                        current_chunk = ""
-                        
-                        for sentence in sentences:
-                            if len(current_chunk) + len(sentence) + 1 <= max_chars_per_chunk:
-                                current_chunk = (current_chunk + " " + sentence).strip()
-                            else:
-                                if current_chunk:
-                                    all_chunks.append(self._create_chunk_obj(
-                                        current_chunk, chunk_idx, scene_idx, add_pauses
-                                    ))
-                                    chunk_idx += 1
-                                
-                                # Handle very long sentence
-                                if len(sentence) > max_chars_per_chunk:
-                                    # Split at commas or force split
-                                    parts = self._force_split(sentence, max_chars_per_chunk)
-                                    for part in parts[:-1]:
-                                        all_chunks.append(self._create_chunk_obj(
-                                            part, chunk_idx, scene_idx, add_pauses
-                                        ))
-                                        chunk_idx += 1
-                                    current_chunk = parts[-1] if parts else ""
-                                else:
-                                    current_chunk = sentence
-                    else:
-                        current_chunk = para
-            
-            # Don't forget last chunk of scene
-            if current_chunk:
-                all_chunks.append(self._create_chunk_obj(
-                    current_chunk, chunk_idx, scene_idx, add_pauses, is_scene_end=True
-                ))
+        total_chars = 0
+        
+        for scene_idx, texts in enumerate(scene_texts):
+            last = len(texts) - 1
+            for i, text in enumerate(texts):
+                chunk = self._create_chunk_obj(
+                    text, chunk_idx, scene_idx, add_pauses, is_scene_end=(i == last)
+                )
+                all_chunks.append(chunk)
+                total_chars += chunk["char_count"]
                 chunk_idx += 1
         
-        # Calculate estimated duration
-        total_chars = sum(c["char_count"] for c in all_chunks)
+        # Calculate estimated duration (total_chars is tallied as chunks are made)
         # Assume ~15 characters per second of speech at 150 WPM
-        estimated_seconds = total_chars / 15
+        estimated_seconds = total_chars * _INV_CPS
         estimated_minutes = estimated_seconds / 60
         
         # Summary
@@ -332,27 +427,63 @@ TTS Chunking Complete:
 """
         
         return (
-            json.dumps(all_chunks, ensure_ascii=False, indent=2),
+            fast_json_dumps(all_chunks, pretty=True),
             len(all_chunks),
             round(estimated_minutes, 1),
             summary.strip()
         )
     
+    def _chunk_scene(self, text: str, max_chars: int, levels: tuple) -> List[str]:
+        """Clean one scene's narration and pack it into chunk texts."""
+        if not text:
+            return []
+        
+        # Clean text for TTS
+        text = self._clean_for_tts(text)
+        if not text:
+            return []
+        
+        chunks = []
+        
+        # Fragments of the chunk being built (including separators) and
+        # their combined length, joined only when the chunk is flushed
+        cur_parts: List[str] = []
+        cur_len = 0
+        
+        # Split into pieces that fit, then pack them greedily into chunks
+        for joiner, piece in self._recursive_split(text, max_chars, levels):
+            if cur_parts and cur_len + len(joiner) + len(piece) <= max_chars:
+                cur_parts.append(joiner)
+                cur_parts.append(piece)
+                cur_len += len(joiner) + len(piece)
+            else:
+                if cur_parts:
+                    chunks.append("".join(cur_parts))
+                cur_parts = [piece]
+                cur_len = len(piece)
+        
+        # Don't forget last chunk of scene
+        if cur_parts:
+            chunks.append("".join(cur_parts))
+        
+        return chunks
+    
     def _clean_for_tts(self, text: str) -> str:
         """Clean text for TTS processing."""
         # Remove markdown
-        text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)
-        text = re.sub(r'\*(.+?)\*', r'\1', text)
-        text = re.sub(r'_(.+?)_', r'\1', text)
-        text = re.sub(r'#{1,6}\s*', '', text)
+        text = _MD_BOLD.sub(r'\1', text)
+        text = _MD_ITALIC.sub(r'\1', text)
+        text = _MD_UND.sub(r'\1', text)
+        text = _MD_HEAD.sub('', text)
         
         # Normalize quotes for TTS
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
+        text = _normalize_quotes(text)
         
         # Remove excessive whitespace
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        text = re.sub(r' {2,}', ' ', text)
+        if '\n\n\n' in text:
+            text = _MULTINEWLINE.sub('\n\n', text)
+        if '  ' in text:
+            text = _MULTISPACE.sub(' ', text)
         
         return text.strip()
     
@@ -363,42 +494,50 @@ TTS Chunking Complete:
         if add_pauses and is_scene_end:
             text = text.rstrip() + " ..."
         
-        word_count = len(text.split())
+        char_count = len(text)
         
         return {
             "index": idx,
             "scene_idx": scene_idx,
             "text": text,
-            "char_count": len(text),
-            "word_count": word_count,
-            "estimated_seconds": len(text) / 15,  # ~15 chars/sec speech
+            "char_count": char_count,
+            "word_count": len(text.split()),
+            "estimated_seconds": char_count * _INV_CPS,
             "is_scene_end": is_scene_end,
             "id": f"tts_chunk_{idx:04d}"
         }
     
-    def _force_split(self, text: str, max_len: int) -> List[str]:
-        """Force split very long text at natural boundaries."""
-        parts = []
-        
-        # Try splitting at commas first
-        if ',' in text:
-            segments = text.split(',')
-            current = ""
-            for seg in segments:
-                if len(current) + len(seg) + 1 <= max_len:
-                    current = (current + "," + seg).strip(',').strip()
-                else:
-                    if current:
-                        parts.append(current)
-                    current = seg.strip()
-            if current:
-                parts.append(current)
-        else:
-            # Force split at max_len
+    @classmethod
+    def _recursive_split(cls, text: str, max_len: int, levels: tuple,
+                         joiner: str = ""):
+        """
+        Yield (joiner, piece) pairs with pieces of at most max_len chars.
+        
+        Text that is too long is split on the first separator level and each
+        piece that still doesn't fit is split on the next one, down to a hard
+        cut at max_len. The joiner is the separator that preceded the piece.
+        """
+        if len(text) <= max_len:
+            yield joiner, text
+            return
+        
+        if not levels:
             for i in range(0, len(text), max_len):
-                parts.append(text[i:i + max_len])
-        
-        return parts
+                yield (joiner if i == 0 else ""), text[i:i + max_len]
+            return
+        
+        # Walk the separator positions and slice pieces out directly rather
+        # than materialising the whole split list up front
+        pattern, sep = levels[0]
+        start = 0
+        for end, next_start in chain(
+            (m.span() for m in pattern.finditer(text)), ((len(text), len(text)),)
+        ):
+            piece = text[start:end].strip()
+            if piece:
+                yield from cls._recursive_split(piece, max_len, levels[1:], joiner)
+                joiner = sep
+            start = next_start
 
 
 class TTSChunkIterator:
@@ -442,24 +581,23 @@ class TTSChunkIterator:
                   chunk_index: int) -> Tuple[str, int, int, float, bool, bool]:
         
         try:
-            chunks = json.loads(tts_chunks_json)
+            table = _parse_chunk_table(tts_chunks_json)
         except json.JSONDecodeError:
             return ("", 0, 0, 0.0, False, False)
         
-        total = len(chunks)
+        total = len(table)
         
         if chunk_index >= total or chunk_index < 0:
             return ("", chunk_index, total, 0.0, False, False)
         
-        chunk = chunks[chunk_index]
         has_more = chunk_index < total - 1
         
         return (
-            chunk.get("text", ""),
+            table.texts[chunk_index],
             chunk_index,
             total,
-            chunk.get("estimated_seconds", 0.0),
-            chunk.get("is_scene_end", False),
+            table.seconds[chunk_index],
+            table.scene_end[chunk_index],
             has_more
         )
 
@@ -510,30 +648,29 @@ class TTSBatchProcessor:
                   batch_index: int) -> Tuple[str, str, int, int, bool]:
         
         try:
-            chunks = json.loads(tts_chunks_json)
+            table = _parse_chunk_table(tts_chunks_json)
         except json.JSONDecodeError:
             return ("[]", "[]", 0, 0, False)
         
-        total_batches = math.ceil(len(chunks) / batch_size)
+        total_batches = -(-len(table) // batch_size)
         
         if batch_index >= total_batches:
             return ("[]", "[]", total_batches, 0, False)
         
         start_idx = batch_index * batch_size
-        end_idx = min(start_idx + batch_size, len(chunks))
-        
-        batch_chunks = chunks[start_idx:end_idx]
+        end_idx = min(start_idx + batch_size, len(table))
         
-        batch_texts = [c.get("text", "") for c in batch_chunks]
-        batch_ids = [c.get("id", f"chunk_{i}") for i, c in enumerate(batch_chunks)]
+        # Columns are cached per input, so a batch is just two slices
+        batch_texts = table.texts[start_idx:end_idx]
+        batch_ids = table.ids[start_idx:end_idx]
         
         has_more = batch_index < total_batches - 1
         
         return (
-            json.dumps(batch_texts, ensure_ascii=False, indent=2),
-            json.dumps(batch_ids, ensure_ascii=False, indent=2),
+            fast_json_dumps(batch_texts, pretty=True),
+            fast_json_dumps(batch_ids, pretty=True),
             total_batches,
-            len(batch_chunks),
+            len(batch_texts),
             has_more
         )
 
@@ -576,9 +713,13 @@ class TTSProgressTracker:
     FUNCTION = "track_progress"
     CATEGORY = "🎬 Story Tools/TTS"
 
-    def track_progress(self, current_chunk: int, total_chunks: int,
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def track_progress(current_chunk: int, total_chunks: int,
                        avg_seconds_per_chunk: float,
                        elapsed_seconds: float) -> Tuple[str, float, float, bool]:
+        # Pure function of its inputs; cached since the node re-runs on
+        # every graph execution
         
         if total_chunks <= 0:
             total_chunks = 1
@@ -605,8 +746,7 @@ class TTSProgressTracker:
         
         elapsed_min = elapsed_seconds / 60
         
-        progress_text = f"""
-╔══════════════════════════════════════════════════════╗
+        progress_text = f"""╔══════════════════════════════════════════════════════╗
 ║              🎤 TTS GENERATION PROGRESS              ║
 ╠══════════════════════════════════════════════════════╣
 ║  [{bar}]  ║
@@ -615,11 +755,10 @@ class TTSProgressTracker:
 ║  ⏱️  Elapsed:     {elapsed_min:>8.1f} minutes                  ║
 ║  ⏳ Remaining:   {remaining_minutes:>8.1f} minutes                  ║
 ║  📊 Status:      {"✅ COMPLETE!" if is_complete else "⏳ Processing...":^20}       ║
-╚══════════════════════════════════════════════════════╝
-"""
+╚══════════════════════════════════════════════════════╝"""
         
         return (
-            progress_text.strip(),
+            progress_text,
             round(percent, 1),
             round(remaining_minutes, 1),
             is_complete
@@ -664,42 +803,48 @@ class AudioSegmentInfo:
                              crossfade_ms: int) -> Tuple[str, str, int]:
         
         try:
-            chunks = json.loads(tts_chunks_json)
+            table = _parse_chunk_table(tts_chunks_json)
         except json.JSONDecodeError:
             return ("{}", "[]", 0)
         
-        # Create file list
+        # Create file list, assembly order, scene breaks and total duration
+        # in one walk over the chunks
         file_list = []
         scene_breaks = []
-        
-        for chunk in chunks:
-            file_name = f"{chunk['id']}.{output_format}"
+        assembly_order = []
+        total_seconds = 0
+        
+        for chunk_id, index, scene_idx, seconds, is_scene_end in zip(
+            table.ids, table.indices, table.scene_idx, table.seconds, table.scene_end
+        ):
+            total_seconds += seconds
+            assembly_order.append(chunk_id)
             file_list.append({
-                "file": file_name,
-                "chunk_id": chunk["id"],
-                "scene_idx": chunk.get("scene_idx", 0),
-                "estimated_duration": chunk.get("estimated_seconds", 0),
-                "is_scene_end": chunk.get("is_scene_end", False)
+                "file": f"{chunk_id}.{output_format}",
+                "chunk_id": chunk_id,
+                "scene_idx": scene_idx,
+                "estimated_duration": seconds,
+                "is_scene_end": is_scene_end
             })
             
-            if chunk.get("is_scene_end", False):
-                scene_breaks.append(chunk["index"])
+            if is_scene_end:
+                scene_breaks.append(index)
         
         # Assembly config
         config = {
             "format": output_format,
             "sample_rate": int(sample_rate),
             "crossfade_ms": crossfade_ms,
-            "total_segments": len(chunks),
+            "total_segments": len(table),
             "scene_breaks": scene_breaks,
-            "estimated_total_seconds": sum(c.get("estimated_seconds", 0) for c in chunks),
-            "assembly_order": [c["id"] for c in chunks]
+            "estimated_total_seconds": total_seconds,
+            "assembly_order": assembly_order
         }
         
         return (
-            json.dumps(config, indent=2),
-            json.dumps(file_list, indent=2),
-            len(chunks)
+            fast_json_dumps(config, pretty=True),
+            fast_json_dumps(file_list, pretty=True),
+            len(table)
         )
 
 
@@ -749,18 +894,16 @@ class DialogueSplitter:
         segments = []
         speakers = set([narrator_tag])
         
-        # Pattern for dialogue with optional speaker
-        # Matches: "dialogue" or "dialogue," said Character or Character said, "dialogue"
-        dialogue_pattern = r'(["""])([^"""]+)\1'
-        
         # Find all dialogue
         last_end = 0
         dialogue_count = 0
         narration_count = 0
         
-        for match in re.finditer(dialogue_pattern, text):
-            # Add narration before this dialogue
-            narration = text[last_end:match.start()].strip()
+        text = _normalize_quotes(text)
+        
+        for match in _DIALOGUE_RE.finditer(text):
+            # Add narration before this dialogue (including any "X said,")
+            narration = text[last_end:match.start("quote") - 1].strip()
             if narration:
                 segments.append({
                     "type": "narration",
@@ -770,21 +913,17 @@ class DialogueSplitter:
                 })
                 narration_count += 1
             
-            # Try to find speaker attribution
-            dialogue_text = match.group(2)
-            speaker = default_speaker
-            
-            # Look for "said X" or "X said" patterns nearby
-            context = text[max(0, match.start()-50):min(len(text), match.end()+50)]
-            speaker_match = re.search(r'(\b[A-Z][a-z]+)\s+said|said\s+(\b[A-Z][a-z]+)', context)
-            if speaker_match:
-                speaker = speaker_match.group(1) or speaker_match.group(2)
+            # Speaker attribution captured by the pattern, if any
+            speaker = match.group("pre") or match.group("post") or match.group("post_rev")
+            if speaker:
                 speakers.add(speaker)
+            else:
+                speaker = default_speaker
             
             segments.append({
                 "type": "dialogue",
                 "speaker": speaker,
-                "text": dialogue_text,
+                "text": match.group("quote"),
                 "index": len(segments)
             })
             dialogue_count += 1
@@ -803,7 +942,7 @@ class DialogueSplitter:
             narration_count += 1
         
         return (
-            json.dumps(segments, ensure_ascii=False, indent=2),
+            fast_json_dumps(segments, pretty=True),
             dialogue_count,
             narration_count,
             ", ".join(sorted(speakers))
@@ -855,18 +994,19 @@ class VoiceAssignmentConfig:
                       default_female_voice: str = "default_female") -> Tuple[str]:
         
         try:
-            characters = json.loads(characters_json)
+            characters = fast_json_loads(characters_json)
         except json.JSONDecodeError:
             characters = []
         
         # Parse voice mapping
-        voice_map = {"NARRATOR": narrator_voice}
-        
-        if voice_mapping:
-            for line in voice_mapping.strip().split('\n'):
-                if ':' in line:
-                    name, voice = line.split(':', 1)
-                    voice_map[name.strip()] = voice.strip()
+        voice_map = {
+            "NARRATOR": narrator_voice,
+            **{
+                name.strip(): voice.strip()
+                for line in voice_mapping.splitlines() if ':' in line
+                for name, voice in (line.split(':', 1),)
+            },
+        }
         
         # Assign default voices to unmapped characters
         for char in characters:
@@ -883,7 +1023,7 @@ class VoiceAssignmentConfig:
             "total_voices": len(set(voice_map.values()))
         }
         
-        return (json.dumps(config, indent=2),)
+        return (fast_json_dumps(config, pretty=True),)
 
 
 class TTSQueueManager:
@@ -914,6 +1054,19 @@ class TTSQueueManager:
                     "min": 1,
                     "max": 100
                 }),
+            },
+            "optional": {
+                "tts_chunks_path": ("STRING", {
+                    "default": "",
+                    "placeholder": "Or enter full path to a chunks .json file...",
+                    "tooltip": "Read chunks from this file instead of tts_chunks_json"
+                }),
+                "compact_json": ("BOOLEAN", {
+                    "default": True,
+                    "label_on": "Compact JSON",
+                    "label_off": "Pretty JSON",
+                    "tooltip": "Compact output is much faster to encode for large batches"
+                }),
             }
         }
 
@@ -930,32 +1083,48 @@ class TTSQueueManager:
     CATEGORY = "🎬 Story Tools/TTS"
 
     def get_next_batch(self, tts_chunks_json: str, completed_indices: str,
-                       batch_size: int) -> Tuple[str, str, int, int, float, bool]:
+                       batch_size: int,
+                       tts_chunks_path: str = "",
+                       compact_json: bool = True) -> Tuple[str, str, int, int, float, bool]:
+        
+        # A chunks file that is set but cannot be read is an error: falling
+        # back to an empty batch would leave the queue never completing
+        if tts_chunks_path:
+            if not os.path.isfile(tts_chunks_path):
+                raise FileNotFoundError(f"TTS chunks file not found: {tts_chunks_path}")
+            try:
+                st = os.stat(tts_chunks_path)
+                table = _load_chunk_table_file(tts_chunks_path, st.st_mtime_ns, st.st_size)
+            except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+                raise ValueError(f"Could not read TTS chunks file {tts_chunks_path}: {e}") from e
         
         try:
-            chunks = json.loads(tts_chunks_json)
-            completed = set(json.loads(completed_indices))
+            if not tts_chunks_path:
+                table = _parse_chunk_table(tts_chunks_json)
+            completed = _parse_completed(completed_indices)
         except json.JSONDecodeError:
             return ("[]", "[]", 0, 0, 0.0, False)
         
-        total = len(chunks)
+        total = len(table)
         completed_count = len(completed)
         
-        # Find remaining chunks
-        remaining = [c for c in chunks if c.get("index", 0) not in completed]
-        remaining_count = len(remaining)
+        # Count remaining chunks from the per-index tally instead of
+        # filtering every chunk
+        index_counts = table.index_counts
+        remaining_count = total - sum(index_counts[i] for i in completed if i in index_counts)
         
-        # Get next batch
-        next_batch = remaining[:batch_size]
-        next_indices = [c.get("index", 0) for c in next_batch]
-        next_texts = [{"index": c.get("index"), "text": c.get("text", "")} for c in next_batch]
+        # Get next batch - stop scanning once it is full
+        pending = (i for i, index in enumerate(table.indices) if index not in completed)
+        next_batch = list(islice(pending, batch_size))
+        next_indices = [table.indices[i] for i in next_batch]
+        next_texts = [{"index": table.indices[i], "text": table.texts[i]} for i in next_batch]
         
         percent = (completed_count / total) * 100 if total > 0 else 100.0
         all_complete = remaining_count == 0
         
         return (
-            json.dumps(next_texts, ensure_ascii=False, indent=2),
-            json.dumps(next_indices),
+            fast_json_dumps(next_texts, pretty=not compact_json),
+            fast_json_dumps(next_indices),
             remaining_count,
             completed_count,
             round(percent, 1),
@@ -4,16 +4,56 @@ Novel Cinematic Orchestrator - Utilities
 Shared utility functions for the node pack.
 """
 
+import hashlib
 import json
+import random
 import re
 import os
-from typing import List, Dict, Any, Optional, Tuple
+import struct
+import time
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+# Optional: orjson is a much faster C/SIMD JSON encoder. Fall back to the
+# standard library when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: xxhash is a much faster non-cryptographic hash for ids.
+# Falls back to hashlib.blake2b.
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Text-cleaning patterns, compiled once at import
+_RE_BOLD = re.compile(r'\*\*(.+?)\*\*')
+_RE_ITALIC = re.compile(r'\*(.+?)\*')
+_RE_UNDERSCORE = re.compile(r'_(.+?)_')
+_RE_STRIKE = re.compile(r'~~(.+?)~~')
+_RE_CODE = re.compile(r'`(.+?)`')
+_RE_HEADER = re.compile(r'#{1,6}\s*')
+_RE_LINK = re.compile(r'\[(.+?)\]\(.+?\)')
+_RE_MULTINEWLINE = re.compile(r'\n{3,}')
+_RE_MULTISPACE = re.compile(r' {2,}')
+# Sentence terminator plus the whitespace after it; sentences are sliced
+# around these matches rather than split on a lookbehind
+_RE_SENTENCE_END = re.compile(r'[.!?]\s+')
+
+
+def _normalize_quotes(text: str) -> str:
+    """Map curly quotes to plain ones (one-to-one, so offsets are unchanged)."""
+    # Chained replace() stays on the fast substring-search path, whereas
+    # str.translate drops to a per-character loop on any non-ASCII text
+    return (text.replace('\u201c', '"').replace('\u201d', '"')
+                .replace('\u2018', "'").replace('\u2019', "'"))
 
 
 def safe_json_loads(json_str: str, default: Any = None) -> Any:
     """Safely parse JSON string with fallback."""
     try:
-        return json.loads(json_str)
+        return fast_json_loads(json_str)
     except (json.JSONDecodeError, TypeError):
         return default if default is not None else {}
 
@@ -21,33 +61,65 @@ def safe_json_loads(json_str: str, default: Any = None) -> Any:
 def safe_json_dumps(obj: Any, **kwargs) -> str:
     """Safely serialize object to JSON string."""
     try:
+        # orjson covers the plain and indent=2 layouts; anything more exotic
+        # goes through the standard library
+        if orjson is not None and kwargs.keys() <= {"indent"} and kwargs.get("indent") in (None, 2):
+            return fast_json_dumps(obj, pretty=bool(kwargs.get("indent")))
         return json.dumps(obj, ensure_ascii=False, **kwargs)
     except (TypeError, ValueError):
         return "{}"
 
 
+def fast_json_dumps(obj: Any, pretty: bool = False) -> str:
+    """Serialize object to JSON string, using orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2 if pretty else None)
+
+
+def fast_json_loads(json_str: Union[str, bytes, memoryview]) -> Any:
+    """Parse JSON string or bytes-like buffer, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(json_str)
+    if isinstance(json_str, memoryview):
+        json_str = json_str.tobytes()
+    return json.loads(json_str)
+
+
 def clean_text_for_tts(text: str) -> str:
     """Clean text for TTS processing."""
     if not text:
         return ""
     
-    # Remove markdown formatting
-    text = re.sub(r'\*\*(.+?)\*\*', r'\1', text)  # Bold
-    text = re.sub(r'\*(.+?)\*', r'\1', text)       # Italic
-    text = re.sub(r'_(.+?)_', r'\1', text)         # Underscore italic
-    text = re.sub(r'~~(.+?)~~', r'\1', text)       # Strikethrough
-    text = re.sub(r'`(.+?)`', r'\1', text)         # Inline code
-    text = re.sub(r'#{1,6}\s*', '', text)          # Headers
-    text = re.sub(r'\[(.+?)\]\(.+?\)', r'\1', text)  # Links
+    # Remove markdown formatting. Each pass only runs when its marker is
+    # present, so plain prose is scanned with a fast substring check
+    # instead of being rewritten by every pattern.
+    if '*' in text:
+        text = _RE_BOLD.sub(r'\1', text)        # Bold
+        text = _RE_ITALIC.sub(r'\1', text)      # Italic
+    if '_' in text:
+        text = _RE_UNDERSCORE.sub(r'\1', text)  # Underscore italic
+    if '~~' in text:
+        text = _RE_STRIKE.sub(r'\1', text)      # Strikethrough
+    if '`' in text:
+        text = _RE_CODE.sub(r'\1', text)        # Inline code
+    if '#' in text:
+        text = _RE_HEADER.sub('', text)         # Headers
+    if '](' in text:
+        text = _RE_LINK.sub(r'\1', text)        # Links
     
     # Normalize quotes
-    text = text.replace('"', '"').replace('"', '"')
-    text = text.replace(''', "'").replace(''', "'")
+    text = _normalize_quotes(text)
     
     # Normalize whitespace
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
-    text = re.sub(r'\t', ' ', text)
+    if '\n\n\n' in text:
+        text = _RE_MULTINEWLINE.sub('\n\n', text)
+    if '  ' in text:
+        text = _RE_MULTISPACE.sub(' ', text)
+    text = text.replace('\t', ' ')
     
     return text.strip()
 
@@ -60,13 +132,25 @@ def estimate_reading_duration(text: str, words_per_minute: int = 150) -> float:
     return (word_count / words_per_minute) * 60
 
 
+def estimate_reading_durations(texts: List[str], words_per_minute: int = 150) -> List[float]:
+    """Estimate reading durations in seconds for a batch of texts."""
+    return [(len(text.split()) / words_per_minute) * 60 if text else 0.0
+            for text in texts]
+
+
 def split_into_sentences(text: str) -> List[str]:
     """Split text into sentences."""
     if not text:
         return []
     
-    # Simple sentence splitting
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    # Simple sentence splitting: cut after each terminator, dropping the
+    # whitespace that follows it
+    sentences = []
+    start = 0
+    for match in _RE_SENTENCE_END.finditer(text):
+        sentences.append(text[start:match.start() + 1])
+        start = match.end()
+    sentences.append(text[start:])
     return [s.strip() for s in sentences if s.strip()]
 
 
@@ -84,16 +168,26 @@ def extract_dialogue(text: str) -> List[Dict[str, str]]:
     if not text:
         return []
     
-    # Pattern for quoted dialogue
-    dialogue_pattern = r'["""]([^"""]+)["""]'
+    text = _normalize_quotes(text)
     
+    # Walk quote to quote; an empty pair ("") is skipped and its closing
+    # quote is tried as the next opener
     dialogues = []
-    for match in re.finditer(dialogue_pattern, text):
+    find = text.find
+    start = find('"')
+    while start != -1:
+        end = find('"', start + 1)
+        if end == -1:
+            break
+        if end == start + 1:
+            start = end
+            continue
         dialogues.append({
-            "text": match.group(1),
-            "start": match.start(),
-            "end": match.end()
+            "text": text[start + 1:end],
+            "start": start,
+            "end": end + 1
         })
+        start = find('"', end + 1)
     
     return dialogues
 
@@ -154,7 +248,7 @@ def merge_configs(*configs: Dict) -> Dict:
 def validate_json_structure(json_str: str, expected_type: type = list) -> Tuple[bool, str]:
     """Validate JSON structure and return status with message."""
     try:
-        data = json.loads(json_str)
+        data = fast_json_loads(json_str)
         if not isinstance(data, expected_type):
             return False, f"Expected {expected_type.__name__}, got {type(data).__name__}"
         return True, "Valid"
@@ -169,12 +263,11 @@ def chunk_list(lst: List, chunk_size: int) -> List[List]:
 
 def generate_unique_id(prefix: str = "", length: int = 8) -> str:
     """Generate a unique identifier."""
-    import hashlib
-    import time
-    import random
-    
-    seed = f"{time.time()}{random.random()}"
-    hash_str = hashlib.md5(seed.encode()).hexdigest()[:length]
+    seed = struct.pack('<dQ', time.time(), random.getrandbits(64))
+    if xxhash is not None:
+        hash_str = xxhash.xxh3_128_hexdigest(seed)[:length]
+    else:
+        hash_str = hashlib.blake2b(seed, digest_size=16).hexdigest()[:length]
     
     if prefix:
         return f"{prefix}_{hash_str}"
@@ -188,10 +281,13 @@ class ProgressTracker:
         self.stages = stages
         self.current_stage = 0
         self.stage_progress = 0.0
+        # Stage count and per-stage share of the total, fixed for the tracker
+        self._num_stages = len(stages)
+        self._stage_weight = 100.0 / self._num_stages if stages else 0.0
     
     def next_stage(self) -> str:
         """Move to next stage and return its name."""
-        if self.current_stage < len(self.stages) - 1:
+        if self.current_stage < self._num_stages - 1:
             self.current_stage += 1
             self.stage_progress = 0.0
         return self.stages[self.current_stage]
@@ -202,10 +298,10 @@ class ProgressTracker:
     
     def get_overall_progress(self) -> float:
         """Get overall progress across all stages."""
-        if not self.stages:
+        if not self._num_stages:
             return 100.0
         
-        stage_weight = 100.0 / len(self.stages)
+        stage_weight = self._stage_weight
         completed = self.current_stage * stage_weight
         current = (self.stage_progress / 100) * stage_weight
         
@@ -218,7 +314,7 @@ class ProgressTracker:
             "stage_index": self.current_stage,
             "stage_progress": self.stage_progress,
             "overall_progress": self.get_overall_progress(),
-            "total_stages": len(self.stages)
+            "total_stages": self._num_stages
         }
 
 
@@ -11,7 +11,56 @@ Output format matches StoryDiffusion_CLIPTextEncode:
 import json
 import re
 from typing import List, Dict, Tuple
-from collections import Counter
+from collections import Counter, OrderedDict
+
+
+# Patterns used by the converter, compiled once at import
+# Capitalized words. Starting with the [A-Z] charset (word boundary checked
+# by a lookbehind) lets the regex engine skip ahead to capital letters
+# instead of testing a boundary at every position.
+_RE_CAP_WORD = re.compile(r'[A-Z](?<=\b[A-Z])[a-z]+\b')
+_RE_SCENE_BREAK = re.compile(r'\n\s*\n|\bChapter\b|\bPART\b|\b\*\*\*\b|---', re.IGNORECASE)
+_RE_LOCATION = re.compile(r'\b(?:in|at|on|by|near) the (\w+(?:\s+\w+)?)\b')
+_RE_ING_ED = re.compile(r'\b(\w+(?:ing|ed))\b')
+_RE_LEADING_WORD = re.compile(r'^(he|she|they|it|the|a|an)\s+')
+
+# Common words to exclude from character detection
+_EXCLUDE_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
+    'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'could', 'should', 'may', 'might', 'must', 'shall', 'can', 'need',
+    'dare', 'ought', 'used', 'it', 'its', 'this', 'that', 'these', 'those',
+    'i', 'you', 'he', 'she', 'we', 'they', 'me', 'him', 'her', 'us', 'them',
+    'my', 'your', 'his', 'our', 'their', 'mine', 'yours', 'hers', 'ours',
+    'what', 'which', 'who', 'whom', 'whose', 'where', 'when', 'why', 'how',
+    'all', 'each', 'every', 'both', 'few', 'more', 'most', 'other', 'some',
+    'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too',
+    'very', 'just', 'also', 'now', 'here', 'there', 'then', 'once', 'never',
+    'always', 'often', 'still', 'already', 'even', 'well', 'back', 'much',
+    'chapter', 'part', 'book', 'page', 'section', 'scene', 'act',
+    'said', 'says', 'asked', 'replied', 'answered', 'told', 'thought',
+    'looked', 'saw', 'went', 'came', 'made', 'got', 'took', 'gave',
+    'one', 'two', 'three', 'four', 'five', 'first', 'second', 'last',
+    'new', 'old', 'good', 'bad', 'great', 'little', 'big', 'small',
+    'long', 'short', 'high', 'low', 'right', 'left', 'next', 'early',
+    'young', 'way', 'day', 'time', 'year', 'man', 'woman', 'people',
+    'thing', 'life', 'world', 'hand', 'eye', 'head', 'face', 'room',
+    'door', 'house', 'home', 'place', 'side', 'night', 'morning',
+    'nothing', 'something', 'everything', 'anything', 'someone', 'everyone',
+    'mr', 'mrs', 'ms', 'dr', 'sir', 'lord', 'lady', 'king', 'queen',
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
+    'january', 'february', 'march', 'april', 'may', 'june', 'july',
+    'august', 'september', 'october', 'november', 'december',
+})
+# Candidate names are always capitalized ([A-Z][a-z]+), so they are
+# checked against capitalized exclusions without lowercasing each one
+_EXCLUDED_CAPS = frozenset(word.capitalize() for word in _EXCLUDE_WORDS)
+
+# Recent convert() results. ComfyUI re-runs the node whenever anything
+# upstream changes, usually with the same novel text and settings.
+_CONVERT_CACHE = OrderedDict()
+_CONVERT_CACHE_SIZE = 8
 
 
 class NovelToStoryDiffusion:
@@ -37,34 +86,7 @@ class NovelToStoryDiffusion:
     """
 
     # Common words to exclude from character detection
-    EXCLUDE_WORDS = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
-        'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-        'could', 'should', 'may', 'might', 'must', 'shall', 'can', 'need',
-        'dare', 'ought', 'used', 'it', 'its', 'this', 'that', 'these', 'those',
-        'i', 'you', 'he', 'she', 'we', 'they', 'me', 'him', 'her', 'us', 'them',
-        'my', 'your', 'his', 'our', 'their', 'mine', 'yours', 'hers', 'ours',
-        'what', 'which', 'who', 'whom', 'whose', 'where', 'when', 'why', 'how',
-        'all', 'each', 'every', 'both', 'few', 'more', 'most', 'other', 'some',
-        'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too',
-        'very', 'just', 'also', 'now', 'here', 'there', 'then', 'once', 'never',
-        'always', 'often', 'still', 'already', 'even', 'well', 'back', 'much',
-        'chapter', 'part', 'book', 'page', 'section', 'scene', 'act',
-        'said', 'says', 'asked', 'replied', 'answered', 'told', 'thought',
-        'looked', 'saw', 'went', 'came', 'made', 'got', 'took', 'gave',
-        'one', 'two', 'three', 'four', 'five', 'first', 'second', 'last',
-        'new', 'old', 'good', 'bad', 'great', 'little', 'big', 'small',
-        'long', 'short', 'high', 'low', 'right', 'left', 'next', 'early',
-        'young', 'way', 'day', 'time', 'year', 'man', 'woman', 'people',
-        'thing', 'life', 'world', 'hand', 'eye', 'head', 'face', 'room',
-        'door', 'house', 'home', 'place', 'side', 'night', 'morning',
-        'nothing', 'something', 'everything', 'anything', 'someone', 'everyone',
-        'mr', 'mrs', 'ms', 'dr', 'sir', 'lord', 'lady', 'king', 'queen',
-        'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
-        'january', 'february', 'march', 'april', 'may', 'june', 'july',
-        'august', 'september', 'october', 'november', 'december',
-    }
+    EXCLUDE_WORDS = _EXCLUDE_WORDS
 
     @classmethod
     def INPUT_TYPES(cls):
@@ -127,6 +149,28 @@ class NovelToStoryDiffusion:
         max_characters: int = 5
     ) -> Tuple[str, str, str, str, int]:
         
+        key = (novel_text, num_scenes, style, character_descriptions, max_characters)
+        result = _CONVERT_CACHE.get(key)
+        if result is not None:
+            _CONVERT_CACHE.move_to_end(key)
+            return result
+        
+        result = self._convert(novel_text, num_scenes, style,
+                               character_descriptions, max_characters)
+        _CONVERT_CACHE[key] = result
+        if len(_CONVERT_CACHE) > _CONVERT_CACHE_SIZE:
+            _CONVERT_CACHE.popitem(last=False)
+        return result
+    
+    def _convert(
+        self,
+        novel_text: str,
+        num_scenes: int,
+        style: str,
+        character_descriptions: str,
+        max_characters: int
+    ) -> Tuple[str, str, str, str, int]:
+        """Run the full conversion; see convert()."""
         if not novel_text or len(novel_text.strip()) < 50:
             return ("", "", "", "❌ Please provide novel text", 0)
         
@@ -157,15 +201,22 @@ class NovelToStoryDiffusion:
         
         # Step 5: Generate scene prompts in Story Diffusion format
         # Format: [CharName] action, style;
-        scene_prompt_list = []
+        scene_prompt_list = [None] * len(scenes)
+        
+        # Lowercase the names once rather than once per scene. With at most
+        # 10 names and 500-char scenes, these substring checks run about twice
+        # as fast as walking a pyahocorasick automaton over the scene.
+        names_lower = [(name, name.lower()) for name in char_names]
+        
+        # Parts shared by every prompt are built once
+        suffix = f", {style_suffix}"
+        # No specific character - use first character
+        default_prefix = f"[{char_names[0]}] " if char_names else ""
         
         for i, scene in enumerate(scenes):
             # Find which characters are in this scene
-            chars_in_scene = []
             scene_lower = scene.lower()
-            for name in char_names:
-                if name.lower() in scene_lower:
-                    chars_in_scene.append(name)
+            chars_in_scene = [name for name, name_lower in names_lower if name_lower in scene_lower]
             
             # Get scene description
             scene_desc = self._summarize_scene(scene)
@@ -176,17 +227,13 @@ class NovelToStoryDiffusion:
                 if len(chars_in_scene) > 1:
                     # Multiple characters - mention both in description
                     other_chars = ', '.join(chars_in_scene[1:])
-                    prompt = f"[{primary_char}] {scene_desc} with {other_chars}, {style_suffix}"
+                    prompt = f"[{primary_char}] {scene_desc} with {other_chars}{suffix}"
                 else:
-                    prompt = f"[{primary_char}] {scene_desc}, {style_suffix}"
+                    prompt = f"[{primary_char}] {scene_desc}{suffix}"
             else:
-                # No specific character - use first character
-                if char_names:
-                    prompt = f"[{char_names[0]}] {scene_desc}, {style_suffix}"
-                else:
-                    prompt = f"{scene_desc}, {style_suffix}"
+                prompt = f"{default_prefix}{scene_desc}{suffix}"
             
-            scene_prompt_list.append(prompt)
+            scene_prompt_list[i] = prompt
         
         # Join with semicolons (Story Diffusion format)
         scene_prompts_semicolon = ";\n".join(scene_prompt_list)
@@ -245,16 +292,13 @@ SCENE PROMPTS (paste in prompt area):
     
     def _extract_characters(self, text: str, max_chars: int) -> List[Dict]:
         """Extract character names from text."""
-        # Find capitalized words that might be names
-        words = re.findall(r'\b([A-Z][a-z]+)\b', text)
-        
-        # Count occurrences
-        word_counts = Counter(words)
+        # Find capitalized words that might be names and count occurrences
+        word_counts = Counter(_RE_CAP_WORD.findall(text))
         
         # Filter out common words
         characters = []
         for word, count in word_counts.most_common(max_chars * 3):
-            if word.lower() not in self.EXCLUDE_WORDS and count >= 2:
+            if word not in _EXCLUDED_CAPS and count >= 2:
                 characters.append({
                     'name': word,
                     'mentions': count,
@@ -308,14 +352,21 @@ SCENE PROMPTS (paste in prompt area):
     
     def _extract_scenes(self, text: str, num_scenes: int) -> List[str]:
         """Extract scene snippets from text."""
-        # Split by chapter markers or double newlines
-        potential_breaks = re.split(r'\n\s*\n|\bChapter\b|\bPART\b|\b\*\*\*\b|---', text, flags=re.IGNORECASE)
-        
+        # Split by chapter markers or double newlines, stopping as soon as
+        # enough scenes have been found
         scenes = []
-        for segment in potential_breaks:
-            segment = segment.strip()
+        start = 0
+        for match in _RE_SCENE_BREAK.finditer(text):
+            segment = text[start:match.start()].strip()
+            start = match.end()
             if len(segment) > 100:  # Minimum scene length
                 scenes.append(segment[:500])  # Take first 500 chars of each
+                if len(scenes) >= num_scenes:
+                    break
+        else:
+            segment = text[start:].strip()
+            if len(segment) > 100:
+                scenes.append(segment[:500])
         
         # If not enough scenes, split text evenly
         if len(scenes) < num_scenes:
@@ -353,12 +404,12 @@ SCENE PROMPTS (paste in prompt area):
         found_elements = []
         
         # Look for locations
-        locations = re.findall(r'\b(?:in|at|on|by|near) the (\w+(?:\s+\w+)?)\b', scene_text.lower())
+        locations = _RE_LOCATION.findall(scene_text.lower())
         if locations:
             found_elements.append(f"in the {locations[0]}")
         
         # Look for actions (verbs ending in -ing or -ed)
-        actions = re.findall(r'\b(\w+(?:ing|ed))\b', scene_text.lower())
+        actions = _RE_ING_ED.findall(scene_text.lower())
         action_words = ['walking', 'sitting', 'standing', 'running', 'driving', 
                        'looking', 'talking', 'eating', 'drinking', 'sleeping',
                        'working', 'reading', 'writing', 'watching', 'waiting',
@@ -387,7 +438,7 @@ SCENE PROMPTS (paste in prompt area):
             
             # Clean up
             snippet = snippet.lower()
-            snippet = re.sub(r'^(he|she|they|it|the|a|an)\s+', '', snippet)
+            snippet = _RE_LEADING_WORD.sub('', snippet)
             
             if len(snippet) > 50:
                 snippet = snippet[:50]
@@ -12,19 +12,256 @@ Features:
 - Supports file upload (.txt, .md, .epub, .pdf, .docx, .rtf)
 """
 
+import codecs
 import json
-import math
+import logging
+import mmap
 import re
 import os
 import hashlib
-from typing import List, Dict, Tuple, Any, Optional
+from typing import List, Dict, Tuple, Any, Optional, Iterable, Iterator, Callable, Sequence
+from array import array
+from bisect import bisect_left
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import accumulate, cycle, islice, product
+from operator import itemgetter
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+# Optional: orjson is a much faster JSON encoder for the large outputs
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: pyahocorasick finds every character name in a scene in one pass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: charset-normalizer identifies legacy encodings for 'auto' loads
+try:
+    import charset_normalizer
+except ImportError:
+    charset_normalizer = None
+
+
+# Patterns used by the file loader, compiled once at import
+_RE_HTML_TAG = re.compile(r'<[^>]+>')
+_RE_HTML_SCRIPT = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_RE_HTML_STYLE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_RE_RTF_CONTROL = re.compile(r'\\[a-z]+\d*\s?')
+_RE_RTF_BRACE = re.compile(r'[{}]')
+_RE_WHITESPACE = re.compile(r'\s+')
+# Script/style openers, complete or cut off at the end of a streamed piece
+_RE_HTML_SCRIPT_OPEN = re.compile(r'<script|<(?:s(?:c(?:r(?:i(?:p)?)?)?)?)?\Z', re.IGNORECASE)
+_RE_HTML_STYLE_OPEN = re.compile(r'<style|<(?:s(?:t(?:y(?:l)?)?)?)?\Z', re.IGNORECASE)
+# What may follow a backslash in an RTF control word that is still growing
+_RE_RTF_CONTROL_TAIL = re.compile(r'[a-z]*\d*')
+# Runs of spaces/tabs; a lone space is left alone instead of being replaced
+# with itself, which is what [ \t]+ did for every word gap
+_RE_HSPACE = re.compile(r'[ \t]{2,}|\t')
+_RE_EXCESS_NEWLINES = re.compile(r'\n{4,}')
+_RE_PAGE_NUMBER = re.compile(r'Page \d+')
+_RE_TRAILING_NUMBER = re.compile(r'\d+\s*$', re.MULTILINE)
+# Header/footer lines (matched against the lowercased, stripped line)
+_RE_PAGE_OR_NUMBER_LINE = re.compile(r'page\s+\d+|\d+$')
+_RE_CHAPTER_LINE = re.compile(r'chapter\s+\d+$')
+
+# Patterns used by the analyzer
+_RE_NAME = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\b')
+_RE_WORD = re.compile(r'\w+')
+_RE_SCENE_BREAK = re.compile(
+    r'\n\s*(?:\*\s*\*\s*\*|\#\#\#|---+|___+|\n\n\n+|Chapter\s+\d+|CHAPTER\s+\d+)\s*\n',
+    re.IGNORECASE
+)
+
+
+def _count_paragraphs(text: str) -> int:
+    """Count non-blank paragraphs (blocks separated by a blank line)."""
+    # Same as counting the pieces with p.strip(), without copying any
+    return sum(1 for p in text.split('\n\n') if p and not p.isspace())
+
+
+def _stripped_len(text: str) -> int:
+    """len(text.strip()), found by walking in from both ends instead of copying."""
+    start, end = 0, len(text)
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end - start
+
+
+def _json_dumps(obj: Any, pretty: bool = True) -> str:
+    """JSON with indent=2 (or compact), encoded by orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else None).decode()
+    # Non-ASCII kept as is and the same separators, matching orjson
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def _json_loads(json_str: str) -> Any:
+    """Parse JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(json_str)
+    return json.loads(json_str)
+
+
+def _name_finder(names: List[str]) -> Callable[[str], List[int]]:
+    """Return a function listing, in order, the indices of names found in a text.
+    
+    A plain substring test, like `name in text`. With pyahocorasick each text
+    is scanned once for all names; otherwise each name is searched for in turn.
+    """
+    if ahocorasick is not None and names:
+        positions = {}
+        for idx, name in enumerate(names):
+            positions.setdefault(name, []).append(idx)
+        automaton = ahocorasick.Automaton()
+        for name, indices in positions.items():
+            automaton.add_word(name, indices)
+        automaton.make_automaton()
+        
+        def find(text: str) -> List[int]:
+            found = set()
+            for _, indices in automaton.iter(text):
+                found.update(indices)
+            return sorted(found)
+        return find
+    
+    def find(text: str) -> List[int]:
+        return [idx for idx, name in enumerate(names) if name in text]
+    return find
+
+
+def _content_hash(text: str, chunk_chars: int = 1 << 20) -> str:
+    """12-hex-digit BLAKE2b fingerprint of text's UTF-8 bytes.
+    
+    The text is encoded a chunk at a time, so no bytes copy of the whole
+    novel is made just to hash it.
+    """
+    digest = hashlib.blake2b(digest_size=6)
+    for start in range(0, len(text), chunk_chars):
+        digest.update(text[start:start + chunk_chars].encode())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=32)
+def _mention_pattern(names: Tuple[str, ...]) -> "re.Pattern":
+    """Case-insensitive whole-word pattern for names, one group per name."""
+    return re.compile(
+        r'\b(?:' + '|'.join(f'({re.escape(name)})' for name in names) + r')\b',
+        re.IGNORECASE
+    )
 
 
 # =============================================================================
 # FILE LOADER - Handles all novel file formats
 # =============================================================================
 
+# Encodings tried in order when the loader is set to 'auto'
+_AUTO_ENCODINGS = ('utf-8', 'latin-1', 'cp1252', 'ascii')
+# Bytes from the start of a non-UTF-8 file handed to charset-normalizer
+_DETECT_SAMPLE_BYTES = 64 * 1024
+
+# Text files at least this large are decoded straight from a memory map
+_MMAP_MIN_BYTES = 4 * 1024 * 1024
+# Piece size for the streamed RTF/HTML fallbacks
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# PDFs with at least this many pages are extracted by a process pool
+_PDF_PARALLEL_MIN_PAGES = 32
+_PDF_MAX_WORKERS = 4
+# Threads used to read EPUB chapters
+_EPUB_MAX_WORKERS = 4
+
+
+def _read_chunks(path: str, encoding: str, errors: str = 'strict') -> Iterator[str]:
+    """Yield a text file in fixed-size pieces, with universal newlines."""
+    with open(path, 'r', encoding=encoding, errors=errors) as f:
+        while True:
+            piece = f.read(_STREAM_CHUNK_SIZE)
+            if not piece:
+                break
+            yield piece
+
+
+def _sub_stream(pieces: Iterable[str], pattern: "re.Pattern", repl: str,
+                safe_end: Callable[[str], int] = len) -> Iterator[str]:
+    """pattern.sub(repl, text) for text that arrives in pieces.
+    
+    safe_end(data) says how much of the buffered text can be substituted on
+    its own; the rest could still become part of a match once more text comes
+    in, so it is carried over to the next piece. Joined together, the output
+    equals pattern.sub over the whole text.
+    """
+    carry = ''
+    for piece in pieces:
+        data = carry + piece
+        cut = safe_end(data)
+        carry = data[cut:]
+        yield pattern.sub(repl, data[:cut])
+    if carry:
+        yield pattern.sub(repl, carry)
+
+
+def _whitespace_end(data: str) -> int:
+    """Hold back a trailing whitespace run, which may continue."""
+    return len(data.rstrip())
+
+
+def _html_tag_end(data: str) -> int:
+    """Hold back from the first '<' with no '>' after it."""
+    start = data.find('<', data.rfind('>') + 1)
+    return len(data) if start < 0 else start
+
+
+def _rtf_control_end(data: str) -> int:
+    """Hold back a control word that runs up to the end of the text."""
+    start = data.rfind('\\')
+    if start >= 0 and _RE_RTF_CONTROL_TAIL.fullmatch(data, start + 1):
+        return start
+    return len(data)
+
+
+def _block_end(pattern: "re.Pattern", opener: "re.Pattern") -> Callable[[str], int]:
+    """safe_end for a script/style pattern: hold back an unclosed block."""
+    def safe_end(data: str) -> int:
+        pos = 0
+        for match in pattern.finditer(data):
+            pos = match.end()
+        start = opener.search(data, pos)
+        return len(data) if start is None else start.start()
+    return safe_end
+
+
+_SCRIPT_END = _block_end(_RE_HTML_SCRIPT, _RE_HTML_SCRIPT_OPEN)
+_STYLE_END = _block_end(_RE_HTML_STYLE, _RE_HTML_STYLE_OPEN)
+
+
+def _extract_pdf_pages(page_range: Tuple[str, int, int]) -> str:
+    """Extract text from pages [start, end) of a PDF. Runs in a worker process."""
+    import fitz  # PyMuPDF
+    path, start, end = page_range
+    doc = fitz.open(path)
+    try:
+        parts = []
+        for page_no in range(start, end):
+            parts.append(doc[page_no].get_text())
+            parts.append("\n\n")
+        return "".join(parts)
+    finally:
+        doc.close()
+
+
 class NovelFileLoader:
     """
     Loads novel text from various file formats.
@@ -60,6 +297,10 @@ class NovelFileLoader:
                 }),
                 "clean_text": ("BOOLEAN", {"default": True}),
                 "remove_headers_footers": ("BOOLEAN", {"default": True}),
+                "parallel_pdf": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "Extract long PDFs in worker processes (off: in-process)"
+                }),
             }
         }
 
@@ -68,12 +309,28 @@ class NovelFileLoader:
     FUNCTION = "load"
     CATEGORY = "📚 Novel to Images"
 
+    # Loader method for each file extension; anything else is tried as plain
+    # text. The loaders in ENCODING_LOADERS also take the encoding option.
+    EXT_LOADERS = {
+        '.txt': '_load_text_file',
+        '.md': '_load_text_file',
+        '.text': '_load_text_file',
+        '.docx': '_load_docx',
+        '.pdf': '_load_pdf',
+        '.epub': '_load_epub',
+        '.rtf': '_load_rtf',
+        '.html': '_load_html',
+        '.htm': '_load_html',
+    }
+    ENCODING_LOADERS = frozenset({'_load_text_file', '_load_html'})
+
     def load(
         self,
         file_path: str,
         encoding: str = "auto",
         clean_text: bool = True,
-        remove_headers_footers: bool = True
+        remove_headers_footers: bool = True,
+        parallel_pdf: bool = False
     ) -> Tuple[str, str, int, str]:
         
         if not file_path or not os.path.exists(file_path):
@@ -85,21 +342,14 @@ class NovelFileLoader:
         
         try:
             # Load based on file type
-            if file_ext in ['.txt', '.md', '.text']:
-                text = self._load_text_file(file_path, encoding)
-            elif file_ext == '.docx':
-                text = self._load_docx(file_path)
-            elif file_ext == '.pdf':
-                text = self._load_pdf(file_path)
-            elif file_ext == '.epub':
-                text = self._load_epub(file_path)
-            elif file_ext == '.rtf':
-                text = self._load_rtf(file_path)
-            elif file_ext in ['.html', '.htm']:
-                text = self._load_html(file_path, encoding)
+            loader_name = self.EXT_LOADERS.get(file_ext, '_load_text_file')
+            loader = getattr(self, loader_name)
+            if loader_name in self.ENCODING_LOADERS:
+                text = loader(file_path, encoding)
+            elif loader_name == '_load_pdf':
+                text = loader(file_path, parallel_pdf)
             else:
-                # Try as plain text
-                text = self._load_text_file(file_path, encoding)
+                text = loader(file_path)
             
             # Clean text if requested
             if clean_text:
@@ -110,7 +360,7 @@ class NovelFileLoader:
             
             word_count = len(text.split())
             
-            file_info = json.dumps({
+            file_info = _json_dumps({
                 "file_name": file_name,
                 "file_path": file_path,
                 "file_size_bytes": file_size,
@@ -118,9 +368,9 @@ class NovelFileLoader:
                 "file_type": file_ext,
                 "word_count": word_count,
                 "character_count": len(text),
-                "line_count": len(text.split('\n')),
-                "paragraph_count": len([p for p in text.split('\n\n') if p.strip()])
-            }, indent=2)
+                "line_count": text.count('\n') + 1,
+                "paragraph_count": _count_paragraphs(text)
+            })
             
             status = f"✅ Loaded: {file_name} ({word_count:,} words)"
             
@@ -131,18 +381,72 @@ class NovelFileLoader:
     
     def _load_text_file(self, path: str, encoding: str) -> str:
         """Load plain text file."""
-        encodings_to_try = ['utf-8', 'latin-1', 'cp1252', 'ascii'] if encoding == 'auto' else [encoding]
-        
-        for enc in encodings_to_try:
+        # Read the file once and try each encoding on the same data. Large
+        # files are decoded from a memory map, skipping the intermediate
+        # bytes copy of the whole file.
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return self._decode_text(data, encoding)
+            return self._decode_text(f.read(), encoding)
+    
+    def _encodings_to_try(self, encoding: str, data) -> Iterator[str]:
+        """Candidate encodings for data, most likely first.
+        
+        For 'auto', UTF-8 comes first. Only if it fails is the start of the
+        data shown to charset-normalizer (when installed), whose guess is
+        tried before the fixed list; latin-1 accepts any bytes, so without
+        it a cp1252 file would never be decoded as cp1252.
+        """
+        if encoding != 'auto':
+            yield encoding
+            return
+        
+        yield _AUTO_ENCODINGS[0]
+        if charset_normalizer is not None:
+            best = charset_normalizer.from_bytes(data[:_DETECT_SAMPLE_BYTES]).best()
+            if best is not None:
+                yield best.encoding
+        yield from _AUTO_ENCODINGS[1:]
+    
+    def _decode_text(self, data, encoding: str) -> str:
+        """Decode raw file contents with the first encoding that fits."""
+        for enc in self._encodings_to_try(encoding, data):
             try:
-                with open(path, 'r', encoding=enc) as f:
-                    return f.read()
+                text = str(data, enc)
             except UnicodeDecodeError:
                 continue
+            # Universal newlines, as a text-mode open() would give
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text
         
-        # Fallback: read as binary and decode with errors='replace'
+        # Fallback: decode with errors='replace'
+        return str(data, 'utf-8', errors='replace')
+    
+    def _detect_encoding(self, path: str, encoding: str) -> Tuple[str, str]:
+        """Pick the encoding _load_text_file would, as (encoding, errors).
+        
+        Each candidate is checked by decoding the file block by block and
+        throwing the result away, so the file is never held in memory.
+        """
         with open(path, 'rb') as f:
-            return f.read().decode('utf-8', errors='replace')
+            sample = f.read(_DETECT_SAMPLE_BYTES)
+        
+        for enc in self._encodings_to_try(encoding, sample):
+            decoder = codecs.getincrementaldecoder(enc)()
+            try:
+                with open(path, 'rb') as f:
+                    while True:
+                        block = f.read(_STREAM_CHUNK_SIZE)
+                        decoder.decode(block, final=not block)
+                        if not block:
+                            break
+            except UnicodeDecodeError:
+                continue
+            return enc, 'strict'
+        
+        return 'utf-8', 'replace'
     
     def _load_docx(self, path: str) -> str:
         """Load Word document."""
@@ -156,42 +460,70 @@ class NovelFileLoader:
             import zipfile
             from xml.etree import ElementTree
             
-            with zipfile.ZipFile(path) as z:
-                xml_content = z.read('word/document.xml')
-                tree = ElementTree.fromstring(xml_content)
-                
-                # Extract text from all w:t elements
-                namespaces = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+            with zipfile.ZipFile(path) as z, z.open('word/document.xml') as raw:
+                # Extract text from all w:t elements, parsing the XML as it is
+                # decompressed and clearing each element once it is done with.
+                # Paragraph breaks go in on 'start' so they land before the
+                # paragraph's text, as with a document-order walk.
                 texts = []
-                for elem in tree.iter():
+                for event, elem in ElementTree.iterparse(raw, events=('start', 'end')):
+                    if event == 'start':
+                        if elem.tag.endswith('}p'):
+                            texts.append('\n')
+                        continue
                     if elem.tag.endswith('}t') and elem.text:
                         texts.append(elem.text)
-                    elif elem.tag.endswith('}p'):
-                        texts.append('\n')
+                    elem.clear()
                 
                 return ''.join(texts)
     
-    def _load_pdf(self, path: str) -> str:
+    def _load_pdf(self, path: str, parallel: bool = False) -> str:
         """Load PDF file."""
         try:
             import fitz  # PyMuPDF
             doc = fitz.open(path)
-            text = ""
-            for page in doc:
-                text += page.get_text() + "\n\n"
-            doc.close()
-            return text
+            try:
+                # Pages are independent, so with parallel on, long documents
+                # are split into contiguous page ranges, each extracted by a
+                # worker process with its own document handle (PyMuPDF is not
+                # thread-safe). Off by default: forking the threaded server
+                # can deadlock, and spawned workers must be able to import
+                # this module by name.
+                page_count = doc.page_count
+                workers = min(os.cpu_count() or 1, _PDF_MAX_WORKERS)
+                if parallel and workers > 1 and page_count >= _PDF_PARALLEL_MIN_PAGES:
+                    step = -(-page_count // workers)
+                    ranges = [(path, start, min(start + step, page_count))
+                              for start in range(0, page_count, step)]
+                    try:
+                        with ProcessPoolExecutor(max_workers=workers) as pool:
+                            return "".join(pool.map(_extract_pdf_pages, ranges))
+                    except (OSError, BrokenProcessPool) as e:
+                        logger.warning(
+                            "Parallel PDF extraction failed (%s); extracting %s in-process", e, path
+                        )
+                
+                # Collect pages and join once; += would copy the growing text
+                # for every page
+                parts = []
+                for page in doc:
+                    parts.append(page.get_text())
+                    parts.append("\n\n")
+                return "".join(parts)
+            finally:
+                doc.close()
         except ImportError:
             try:
                 # Fallback to pdfplumber
                 import pdfplumber
-                text = ""
+                parts = []
                 with pdfplumber.open(path) as pdf:
                     for page in pdf.pages:
                         page_text = page.extract_text()
                         if page_text:
-                            text += page_text + "\n\n"
-                return text
+                            parts.append(page_text)
+                            parts.append("\n\n")
+                return "".join(parts)
             except ImportError:
                 raise ImportError("Install PyMuPDF (fitz) or pdfplumber: pip install pymupdf pdfplumber")
     
@@ -216,15 +548,25 @@ class NovelFileLoader:
             import zipfile
             from xml.etree import ElementTree
             
-            text_parts = []
             with zipfile.ZipFile(path) as z:
-                for name in z.namelist():
-                    if name.endswith(('.html', '.xhtml', '.htm')):
-                        content = z.read(name).decode('utf-8', errors='replace')
-                        # Simple HTML tag removal
-                        clean = re.sub(r'<[^>]+>', ' ', content)
-                        clean = re.sub(r'\s+', ' ', clean)
-                        text_parts.append(clean.strip())
+                names = [name for name in z.namelist() if name.endswith(('.html', '.xhtml', '.htm'))]
+                
+                def extract(name: str) -> str:
+                    content = z.read(name).decode('utf-8', errors='replace')
+                    # Simple HTML tag removal
+                    clean = _RE_HTML_TAG.sub(' ', content)
+                    clean = _RE_WHITESPACE.sub(' ', clean)
+                    return clean.strip()
+                
+                # Chapters are independent and decompression releases the
+                # GIL, so they are read on a small thread pool; map() keeps
+                # reading order
+                workers = min(len(names), os.cpu_count() or 1, _EPUB_MAX_WORKERS)
+                if workers > 1:
+                    with ThreadPoolExecutor(max_workers=workers) as pool:
+                        text_parts = list(pool.map(extract, names))
+                else:
+                    text_parts = [extract(name) for name in names]
             
             return '\n\n'.join(text_parts)
     
@@ -236,73 +578,80 @@ class NovelFileLoader:
                 rtf_content = f.read()
             return rtf_to_text(rtf_content)
         except ImportError:
-            # Basic RTF parsing
-            with open(path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
+            # Basic RTF parsing, streamed so only the cleaned text is ever
+            # held in full
+            pieces = _read_chunks(path, 'utf-8', 'replace')
             
             # Remove RTF control words
-            content = re.sub(r'\\[a-z]+\d*\s?', '', content)
-            content = re.sub(r'[{}]', '', content)
-            content = re.sub(r'\s+', ' ', content)
-            return content.strip()
+            pieces = _sub_stream(pieces, _RE_RTF_CONTROL, '', _rtf_control_end)
+            pieces = _sub_stream(pieces, _RE_RTF_BRACE, '')
+            pieces = _sub_stream(pieces, _RE_WHITESPACE, ' ', _whitespace_end)
+            return ''.join(pieces).strip()
     
     def _load_html(self, path: str, encoding: str) -> str:
         """Load HTML file."""
-        content = self._load_text_file(path, encoding)
-        
         try:
             from bs4 import BeautifulSoup
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "header", "footer"]):
-                script.decompose()
-            
-            return soup.get_text(separator='\n')
         except ImportError:
-            # Basic HTML tag removal
-            clean = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.DOTALL | re.IGNORECASE)
-            clean = re.sub(r'<style[^>]*>.*?</style>', '', clean, flags=re.DOTALL | re.IGNORECASE)
-            clean = re.sub(r'<[^>]+>', ' ', clean)
-            clean = re.sub(r'\s+', ' ', clean)
-            return clean.strip()
+            # Basic HTML tag removal, streamed like the RTF fallback
+            pieces = _read_chunks(path, *self._detect_encoding(path, encoding))
+            pieces = _sub_stream(pieces, _RE_HTML_SCRIPT, '', _SCRIPT_END)
+            pieces = _sub_stream(pieces, _RE_HTML_STYLE, '', _STYLE_END)
+            pieces = _sub_stream(pieces, _RE_HTML_TAG, ' ', _html_tag_end)
+            pieces = _sub_stream(pieces, _RE_WHITESPACE, ' ', _whitespace_end)
+            return ''.join(pieces).strip()
+        
+        content = self._load_text_file(path, encoding)
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # Remove script and style elements
+        for script in soup(["script", "style", "nav", "header", "footer"]):
+            script.decompose()
+        
+        return soup.get_text(separator='\n')
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
         # Normalize line endings
-        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
         
         # Remove excessive whitespace
-        text = re.sub(r'[ \t]+', ' ', text)
-        text = re.sub(r'\n{4,}', '\n\n\n', text)
+        text = _RE_HSPACE.sub(' ', text)
+        if '\n\n\n\n' in text:
+            text = _RE_EXCESS_NEWLINES.sub('\n\n\n', text)
         
         # Remove common artifacts
-        text = re.sub(r'Page \d+', '', text)
-        text = re.sub(r'\d+\s*$', '', text, flags=re.MULTILINE)
+        if 'Page ' in text:
+            text = _RE_PAGE_NUMBER.sub('', text)
+        text = _RE_TRAILING_NUMBER.sub('', text)
         
         # Clean up quotes
-        text = text.replace('"', '"').replace('"', '"')
-        text = text.replace(''', "'").replace(''', "'")
+        text = text.replace('\u201c', '"').replace('\u201d', '"')
+        text = text.replace('\u2018', "'").replace('\u2019', "'")
         
         return text.strip()
     
     def _remove_headers_footers(self, text: str) -> str:
         """Remove common headers/footers."""
+        # Kept as a per-line loop on purpose: one MULTILINE regex over the
+        # whole text has to try every character as a line start and scan
+        # each line for the copyright phrases, which is several times
+        # slower than split() plus substring checks on ordinary prose.
         lines = text.split('\n')
         cleaned = []
         
         for line in lines:
             line_lower = line.lower().strip()
             
-            # Skip common header/footer patterns
-            if any([
-                re.match(r'^page\s+\d+', line_lower),
-                re.match(r'^\d+$', line_lower),
-                re.match(r'^chapter\s+\d+$', line_lower) and len(line) < 15,
-                'all rights reserved' in line_lower,
-                'copyright ©' in line_lower,
-                'isbn' in line_lower and len(line) < 30,
-            ]):
+            # Skip common header/footer patterns (cheapest checks first)
+            if (
+                _RE_PAGE_OR_NUMBER_LINE.match(line_lower)
+                or (len(line) < 15 and _RE_CHAPTER_LINE.match(line_lower))
+                or 'all rights reserved' in line_lower
+                or 'copyright ©' in line_lower
+                or (len(line) < 30 and 'isbn' in line_lower)
+            ):
                 continue
             
             cleaned.append(line)
@@ -395,11 +744,38 @@ class NovelAnalyzer:
     # Titles to strip from names
     TITLES = {"mr", "mrs", "ms", "miss", "dr", "prof", "sir", "lady", "lord", "king", "queen", "prince", "princess"}
 
+    # Capitalized forms of the words above. Single-word name candidates are
+    # always capitalized, so they can be dropped without lowercasing each one.
+    SKIP_CAPS = frozenset(word.capitalize() for word in COMMON_WORDS | TITLES)
+    # Lowercased words that never count as a character name
+    SKIP_WORDS = frozenset(COMMON_WORDS | TITLES)
+
     def analyze(
         self,
         novel_text: str,
         custom_character_list: str = ""
     ) -> Tuple[str, str, str, str, int, int, int, float]:
+        novel_data, characters, scenes, summary, word_count, character_count, scene_count, video_hours = (
+            self._analyze_impl(novel_text, custom_character_list)
+        )
+        
+        return (
+            _json_dumps(novel_data),
+            _json_dumps(characters),
+            _json_dumps(scenes),
+            summary,
+            word_count,
+            character_count,
+            scene_count,
+            video_hours
+        )
+    
+    def _analyze_impl(
+        self,
+        novel_text: str,
+        custom_character_list: str = ""
+    ) -> Tuple[Dict, List[Dict], List[Dict], str, int, int, int, float]:
+        """analyze() without the JSON encoding, for callers in this module."""
         
         # Basic stats
         word_count = len(novel_text.split())
@@ -415,19 +791,20 @@ class NovelAnalyzer:
         video_hours = video_minutes / 60
         
         # Build novel data
+        tier_counts = Counter(char["tier"] for char in characters)
         novel_data = {
             "word_count": word_count,
             "character_count": len(novel_text),
-            "paragraph_count": len([p for p in novel_text.split('\n\n') if p.strip()]),
+            "paragraph_count": _count_paragraphs(novel_text),
             "scene_count": len(scenes),
             "total_characters": len(characters),
-            "main_characters": len([c for c in characters if c["tier"] == "main"]),
-            "supporting_characters": len([c for c in characters if c["tier"] == "supporting"]),
-            "minor_characters": len([c for c in characters if c["tier"] == "minor"]),
-            "background_characters": len([c for c in characters if c["tier"] == "background"]),
+            "main_characters": tier_counts["main"],
+            "supporting_characters": tier_counts["supporting"],
+            "minor_characters": tier_counts["minor"],
+            "background_characters": tier_counts["background"],
             "estimated_video_minutes": video_minutes,
             "estimated_video_hours": video_hours,
-            "hash": hashlib.md5(novel_text.encode()).hexdigest()[:12]
+            "hash": _content_hash(novel_text)
         }
         
         # Summary
@@ -461,9 +838,9 @@ class NovelAnalyzer:
         summary += "╚══════════════════════════════════════════════════════════════════════════════╝"
         
         return (
-            json.dumps(novel_data, indent=2),
-            json.dumps(characters, indent=2),
-            json.dumps(scenes, indent=2),
+            novel_data,
+            characters,
+            scenes,
             summary.strip(),
             word_count,
             len(characters),
@@ -474,118 +851,129 @@ class NovelAnalyzer:
     def _extract_characters(self, text: str, custom_list: str) -> List[Dict]:
         """Extract character names from text with mention counts."""
         
-        # Find capitalized words that might be names
-        name_pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\b'
-        potential_names = re.findall(name_pattern, text)
-        
-        # Count occurrences
-        name_counts = Counter(potential_names)
+        # Find capitalized words that might be names and count occurrences.
+        # Common words and titles are skipped here so they never enter the
+        # counter (the filter below drops them anyway).
+        skip = self.SKIP_CAPS
+        name_counts = Counter(
+            name for name in map(itemgetter(1), _RE_NAME.finditer(text))
+            if name not in skip
+        )
         
         # Add custom characters
         if custom_list.strip():
-            for name in custom_list.strip().split('\n'):
-                name = name.strip()
-                if name:
-                    # Count mentions in text
-                    count = len(re.findall(r'\b' + re.escape(name) + r'\b', text, re.IGNORECASE))
-                    name_counts[name] = max(name_counts.get(name, 0), count)
-        
-        # Filter and classify
-        characters = []
-        for name, count in name_counts.most_common():
-            # Skip common words and short names
-            if name.lower() in self.COMMON_WORDS:
-                continue
-            if len(name) < 2:
+            custom_names = [name.strip() for name in custom_list.strip().split('\n') if name.strip()]
+            # Count mentions in text
+            mentions = self._count_mentions(text, custom_names)
+            for name in custom_names:
+                name_counts[name] = max(name_counts.get(name, 0), mentions[name.lower()])
+        
+        # Filter before sorting, so the long tail of one-off capitalized
+        # words is never sorted
+        skip = self.SKIP_WORDS
+        candidates = []
+        for name, count in name_counts.items():
+            # Skip if appears only at start of sentences (likely not a name),
+            # and short names
+            if count < 2 or len(name) < 2:
                 continue
-            # Skip if it's just a title
-            if name.lower() in self.TITLES:
+            # Skip common words and bare titles
+            lowered = name.lower()
+            if lowered in skip:
                 continue
-            # Skip if appears only at start of sentences (likely not a name)
-            if count < 2:
-                continue
-            
-            # Determine tier based on mentions
+            candidates.append((name, count, lowered))
+        
+        # Same order as most_common(): the sort is stable
+        candidates.sort(key=itemgetter(1), reverse=True)
+        
+        # Classify
+        characters = []
+        for name, count, lowered in candidates:
+            # Determine tier based on mentions. Every candidate has at least
+            # 2, so none is ever a single-mention "background" character.
             if count >= 20:
                 tier = "main"
                 refs_needed = 3
             elif count >= 5:
                 tier = "supporting"
                 refs_needed = 2
-            elif count >= 2:
+            else:
                 tier = "minor"
                 refs_needed = 1
-            else:
-                tier = "background"
-                refs_needed = 0
             
             characters.append({
                 "name": name,
                 "mentions": count,
                 "tier": tier,
                 "refs_needed": refs_needed,
-                "id": f"char_{name.lower().replace(' ', '_')}"
+                "id": f"char_{lowered.replace(' ', '_')}"
             })
         
         return characters
     
+    def _count_mentions(self, text: str, names: List[str]) -> Dict[str, int]:
+        """Count case-insensitive whole-word mentions, keyed by lowercased name."""
+        counts = dict.fromkeys((name.lower() for name in names), 0)
+        
+        # Single-word names always match a whole word, so they cannot
+        # overlap and are all counted in one pass of a combined pattern
+        words = [name for name in counts if _RE_WORD.fullmatch(name)]
+        if words:
+            for match in _mention_pattern(tuple(words)).finditer(text):
+                counts[words[match.lastindex - 1]] += 1
+        
+        # Multi-word names may overlap each other, so each gets its own pass
+        for name in counts.keys() - set(words):
+            counts[name] = sum(1 for _ in _mention_pattern((name,)).finditer(text))
+        
+        return counts
+    
     def _extract_scenes(self, text: str) -> List[Dict]:
         """Extract scenes from text."""
         scenes = []
         
-        # Split by common scene breaks
-        scene_breaks = re.split(
-            r'\n\s*(?:\*\s*\*\s*\*|\#\#\#|---+|___+|\n\n\n+|Chapter\s+\d+|CHAPTER\s+\d+)\s*\n',
-            text,
-            flags=re.IGNORECASE
-        )
+        # Find common scene breaks. Only their offsets are kept, so each
+        # scene is sliced out of the text once instead of re.split() first
+        # copying every segment.
+        scene_breaks = list(_RE_SCENE_BREAK.finditer(text))
         
         # If no breaks found, split by double newlines
-        if len(scene_breaks) <= 1:
+        if not scene_breaks:
             paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-            # Group paragraphs into scenes (roughly 500 words each)
-            current_scene = []
-            current_words = 0
+            # Group paragraphs into scenes (roughly 500 words each). With a
+            # running word total, each scene ends at the first paragraph
+            # that brings it to 500 words, found by bisection.
+            cumulative = list(accumulate(len(para.split()) for para in paragraphs))
+            num_paragraphs = len(paragraphs)
+            start = 0
+            words_before = 0
             scene_idx = 0
             
-            for para in paragraphs:
-                para_words = len(para.split())
-                current_scene.append(para)
-                current_words += para_words
-                
-                if current_words >= 500:
-                    scene_text = '\n\n'.join(current_scene)
-                    scenes.append({
-                        "id": f"scene_{scene_idx+1:04d}",
-                        "index": scene_idx,
-                        "text": scene_text,
-                        "word_count": current_words,
-                        "paragraph_count": len(current_scene)
-                    })
-                    scene_idx += 1
-                    current_scene = []
-                    current_words = 0
-            
-            # Add remaining
-            if current_scene:
-                scene_text = '\n\n'.join(current_scene)
+            while start < num_paragraphs:
+                # Last scene takes whatever remains
+                end = min(bisect_left(cumulative, words_before + 500, start), num_paragraphs - 1)
                 scenes.append({
                     "id": f"scene_{scene_idx+1:04d}",
                     "index": scene_idx,
-                    "text": scene_text,
-                    "word_count": current_words,
-                    "paragraph_count": len(current_scene)
+                    "text": '\n\n'.join(paragraphs[start:end + 1]),
+                    "word_count": cumulative[end] - words_before,
+                    "paragraph_count": end + 1 - start
                 })
+                scene_idx += 1
+                start = end + 1
+                words_before = cumulative[end]
         else:
-            for idx, scene_text in enumerate(scene_breaks):
-                scene_text = scene_text.strip()
+            starts = [0] + [match.end() for match in scene_breaks]
+            ends = [match.start() for match in scene_breaks] + [len(text)]
+            for idx, (start, end) in enumerate(zip(starts, ends)):
+                scene_text = text[start:end].strip()
                 if scene_text:
                     scenes.append({
                         "id": f"scene_{idx+1:04d}",
                         "index": idx,
                         "text": scene_text,
                         "word_count": len(scene_text.split()),
-                        "paragraph_count": len([p for p in scene_text.split('\n\n') if p.strip()])
+                        "paragraph_count": _count_paragraphs(scene_text)
                     })
         
         return scenes
@@ -595,6 +983,19 @@ class NovelAnalyzer:
 # IMAGE CALCULATOR - Determines exact image counts
 # =============================================================================
 
+# Prompt lists from the latest TurnkeyNovelToImages run, keyed by the JSON
+# string returned for each. The batch and single-prompt nodes look their
+# input up here first and reuse the objects instead of parsing them back.
+_RECENT_PROMPT_LISTS: Dict[str, List[Dict[str, Any]]] = {}
+
+# Seconds of narration per image, shared by the calculator and the pipeline
+_DENSITY_INTERVALS = MappingProxyType({
+    "sparse": 15,      # 1 image every 15 seconds
+    "standard": 10,    # 1 image every 10 seconds
+    "cinematic": 6,    # 1 image every 6 seconds
+    "dense": 4         # 1 image every 4 seconds
+})
+
 class ImageCalculator:
     """
     Calculates exactly how many images will be generated.
@@ -616,7 +1017,7 @@ class ImageCalculator:
             "required": {
                 "novel_data_json": ("STRING", {"multiline": True}),
                 "characters_json": ("STRING", {"multiline": True}),
-                "image_density": (["sparse", "standard", "cinematic", "dense"], {
+                "image_density": (list(_DENSITY_INTERVALS), {
                     "default": "standard"
                 }),
             },
@@ -644,12 +1045,7 @@ class ImageCalculator:
     FUNCTION = "calculate"
     CATEGORY = "📚 Novel to Images"
 
-    DENSITY_INTERVALS = {
-        "sparse": 15,      # 1 image every 15 seconds
-        "standard": 10,    # 1 image every 10 seconds
-        "cinematic": 6,    # 1 image every 6 seconds
-        "dense": 4         # 1 image every 4 seconds
-    }
+    DENSITY_INTERVALS = _DENSITY_INTERVALS
 
     def calculate(
         self,
@@ -662,11 +1058,40 @@ class ImageCalculator:
     ) -> Tuple[str, int, int, int, str]:
         
         try:
-            novel_data = json.loads(novel_data_json)
-            characters = json.loads(characters_json)
-        except:
+            novel_data = _json_loads(novel_data_json)
+            characters = _json_loads(characters_json)
+        except (ValueError, TypeError):
+            # Malformed JSON (both decoders raise a ValueError) or no input
             return ("{}", 0, 0, 0, "Error: Invalid JSON input")
         
+        image_plan, total_story_images, ref_images, total_all, summary = self._calculate_impl(
+            novel_data,
+            characters,
+            image_density,
+            custom_interval_seconds,
+            include_establishing_shots,
+            include_character_closeups
+        )
+        
+        return (
+            json.dumps(image_plan, indent=2),
+            total_story_images,
+            ref_images,
+            total_all,
+            summary
+        )
+    
+    def _calculate_impl(
+        self,
+        novel_data: Dict,
+        characters: List[Dict],
+        image_density: str,
+        custom_interval_seconds: float = 0,
+        include_establishing_shots: bool = True,
+        include_character_closeups: bool = True
+    ) -> Tuple[Dict, int, int, int, str]:
+        """calculate() on already-parsed input, returning the plan as a dict."""
+        
         # Determine interval
         interval = custom_interval_seconds if custom_interval_seconds > 0 else self.DENSITY_INTERVALS[image_density]
         
@@ -674,23 +1099,30 @@ class ImageCalculator:
         word_count = novel_data.get("word_count", 0)
         video_seconds = (word_count / 150) * 60  # 150 WPM
         
-        # Base story images
-        base_images = int(video_seconds / interval)
+        # Base story images, floored without going through the float
+        # quotient, which can land just under a whole number (1230 words at
+        # 4s per image came out as 122 rather than 123)
+        base_images = int(word_count * 60 // (150 * interval))
         
         # Additional images
         establishing_shots = novel_data.get("scene_count", 0) if include_establishing_shots else 0
         
         # Character closeups (1 per main character per 10 scenes)
-        main_chars = len([c for c in characters if c.get("tier") == "main"])
+        tier_counts = Counter(c.get("tier") for c in characters)
+        main_chars = tier_counts["main"]
         scene_count = novel_data.get("scene_count", 1)
-        closeups = int(main_chars * (scene_count / 10)) if include_character_closeups else 0
+        closeups = int(main_chars * scene_count // 10) if include_character_closeups else 0
         
         total_story_images = base_images + establishing_shots + closeups
         
         # Reference images
         ref_images = sum(c.get("refs_needed", 0) for c in characters)
+        main_refs = main_chars * 3
+        supporting_refs = tier_counts["supporting"] * 2
+        minor_refs = tier_counts["minor"] * 1
         
         total_all = total_story_images + ref_images
+        storage_gb = (total_all * 5) / 1024
         
         # Build image plan
         image_plan = {
@@ -707,16 +1139,16 @@ class ImageCalculator:
             },
             
             "reference_images": {
-                "main_characters": len([c for c in characters if c.get("tier") == "main"]) * 3,
-                "supporting_characters": len([c for c in characters if c.get("tier") == "supporting"]) * 2,
-                "minor_characters": len([c for c in characters if c.get("tier") == "minor"]) * 1,
+                "main_characters": main_refs,
+                "supporting_characters": supporting_refs,
+                "minor_characters": minor_refs,
                 "total": ref_images
             },
             
             "total_all_images": total_all,
             
             "storage_estimate_mb": total_all * 5,  # ~5MB per image average
-            "storage_estimate_gb": (total_all * 5) / 1024
+            "storage_estimate_gb": storage_gb
         }
         
         # Summary
@@ -736,20 +1168,20 @@ class ImageCalculator:
 ║  └─ SUBTOTAL:                {total_story_images:>12,}                                    ║
 ╠══════════════════════════════════════════════════════════════════════════════╣
 ║  CHARACTER REFERENCES                                                        ║
-║  ├─ Main (3 refs each):      {image_plan['reference_images']['main_characters']:>12,}                                    ║
-║  ├─ Supporting (2 each):     {image_plan['reference_images']['supporting_characters']:>12,}                                    ║
-║  ├─ Minor (1 each):          {image_plan['reference_images']['minor_characters']:>12,}                                    ║
+║  ├─ Main (3 refs each):      {main_refs:>12,}                                    ║
+║  ├─ Supporting (2 each):     {supporting_refs:>12,}                                    ║
+║  ├─ Minor (1 each):          {minor_refs:>12,}                                    ║
 ║  └─ SUBTOTAL:                {ref_images:>12,}                                    ║
 ╠══════════════════════════════════════════════════════════════════════════════╣
 ║  ════════════════════════════════════════════════════════════════════════    ║
 ║  📸 TOTAL IMAGES:            {total_all:>12,}                                    ║
-║  💾 Storage Needed:          {image_plan['storage_estimate_gb']:>12.1f} GB                                  ║
+║  💾 Storage Needed:          {storage_gb:>12.1f} GB                                  ║
 ║  ════════════════════════════════════════════════════════════════════════    ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
         
         return (
-            json.dumps(image_plan, indent=2),
+            image_plan,
             total_story_images,
             ref_images,
             total_all,
@@ -799,7 +1231,7 @@ class TurnkeyNovelToImages:
                     "default": "file_upload",
                     "tooltip": "Choose how to provide your novel"
                 }),
-                "image_density": (["sparse", "standard", "cinematic", "dense"], {
+                "image_density": (list(_DENSITY_INTERVALS), {
                     "default": "standard",
                     "tooltip": "sparse=fast, cinematic=quality"
                 }),
@@ -837,6 +1269,10 @@ class TurnkeyNovelToImages:
                 }),
                 "seed": ("INT", {"default": -1, "min": -1, "max": 2147483647}),
                 "batch_size": ("INT", {"default": 4, "min": 1, "max": 16}),
+                "output_dir": ("STRING", {
+                    "default": "",
+                    "placeholder": "Optional: write prompts to <dir>/prompts.jsonl instead of returning them"
+                }),
             }
         }
 
@@ -872,12 +1308,43 @@ class TurnkeyNovelToImages:
     }
     
     # Density intervals
-    DENSITY_INTERVALS = {
-        "sparse": 15,
-        "standard": 10,
-        "cinematic": 6,
-        "dense": 4
-    }
+    DENSITY_INTERVALS = _DENSITY_INTERVALS
+    
+    # Reference sheet views, in the order a character's refs_needed takes them
+    REFERENCE_VIEWS = (
+        ("front", "front view portrait, facing camera, head and shoulders"),
+        ("three_quarter", "three-quarter view portrait, slight turn, head and shoulders"),
+        ("profile", "side profile portrait, head and shoulders")
+    )
+    
+    # The sub-nodes hold no per-call state, so one instance of each is reused
+    _loader = NovelFileLoader()
+    _analyzer = NovelAnalyzer()
+    _calculator = ImageCalculator()
+    # Last successfully loaded file: ((path, mtime_ns, size), load result)
+    _last_load = None
+    
+    def _load_novel_file(self, file_path: str) -> Tuple[str, str, int, str]:
+        """Load a novel file, reusing the previous result if it is unchanged"""
+        try:
+            st = os.stat(file_path)
+            key = (os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+        
+        cached = TurnkeyNovelToImages._last_load
+        if key is not None and cached is not None and cached[0] == key:
+            return cached[1]
+        
+        result = self._loader.load(
+            file_path=file_path,
+            encoding="auto",
+            clean_text=True,
+            remove_headers_footers=True
+        )
+        if key is not None and result[0]:
+            TurnkeyNovelToImages._last_load = (key, result)
+        return result
 
     def process(
         self,
@@ -891,18 +1358,13 @@ class TurnkeyNovelToImages:
         custom_style_prompt: str = "",
         negative_prompt: str = "",
         seed: int = -1,
-        batch_size: int = 4
+        batch_size: int = 4,
+        output_dir: str = ""
     ) -> Tuple[str, str, str, str, str, int, int, str]:
         
         # ===== STEP 0: Load Novel from File or Text =====
         if input_mode == "file_upload" and novel_file:
-            loader = NovelFileLoader()
-            loaded_text, file_info, loaded_words, load_status = loader.load(
-                file_path=novel_file,
-                encoding="auto",
-                clean_text=True,
-                remove_headers_footers=True
-            )
+            loaded_text, file_info, loaded_words, load_status = self._load_novel_file(novel_file)
             
             if not loaded_text:
                 # Return error state
@@ -929,7 +1391,7 @@ class TurnkeyNovelToImages:
             actual_novel_text = novel_text
             source_info = "Pasted text"
         
-        if not actual_novel_text or len(actual_novel_text.strip()) < 100:
+        if not actual_novel_text or _stripped_len(actual_novel_text) < 100:
             error_summary = """
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║                          ❌ NO NOVEL TEXT PROVIDED                            ║
@@ -950,25 +1412,23 @@ class TurnkeyNovelToImages:
 """
             return ("[]", "[]", "[]", "[]", "{}", 0, 0, error_summary.strip())
         
+        # Parse custom character descriptions. Without any "name: description"
+        # lines, the first line is passed to the analyzer as an extra name.
+        custom_lines = custom_characters.split('\n')
+        char_descriptions = {}
+        for line in custom_lines:
+            if ':' in line:
+                name, desc = line.split(':', 1)
+                char_descriptions[name.strip().lower()] = desc.strip()
+        
         # ===== STEP 1: Analyze Novel =====
-        analyzer = NovelAnalyzer()
-        novel_data_json, characters_json, scenes_json, analysis_summary, word_count, char_count, scene_count, video_hours = analyzer.analyze(
+        # The sub-nodes' object-level entry points are used so that nothing
+        # is encoded to JSON and parsed straight back between steps
+        novel_data, characters, scenes, analysis_summary, word_count, char_count, scene_count, video_hours = self._analyzer._analyze_impl(
             novel_text=actual_novel_text,
-            custom_character_list=custom_characters.split('\n')[0] if ':' not in custom_characters else ""
+            custom_character_list=custom_lines[0] if not char_descriptions else ""
         )
         
-        novel_data = json.loads(novel_data_json)
-        characters = json.loads(characters_json)
-        scenes = json.loads(scenes_json)
-        
-        # Parse custom character descriptions
-        char_descriptions = {}
-        if custom_characters.strip():
-            for line in custom_characters.strip().split('\n'):
-                if ':' in line:
-                    name, desc = line.split(':', 1)
-                    char_descriptions[name.strip().lower()] = desc.strip()
-        
         # Update characters with descriptions
         for char in characters:
             char_name_lower = char["name"].lower()
@@ -978,134 +1438,92 @@ class TurnkeyNovelToImages:
                 char["description"] = f"character named {char['name']}"
         
         # ===== STEP 2: Calculate Images =====
-        calculator = ImageCalculator()
-        image_plan_json, total_story_images, total_ref_images, total_all_images, calc_summary = calculator.calculate(
-            novel_data_json=novel_data_json,
-            characters_json=characters_json,
+        image_plan, total_story_images, total_ref_images, total_all_images, calc_summary = self._calculator._calculate_impl(
+            novel_data=novel_data,
+            characters=characters,
             image_density=image_density
         )
         
-        image_plan = json.loads(image_plan_json)
-        
         # ===== STEP 3: Generate Reference Prompts =====
         style_template = self.STYLES.get(style, self.STYLES["cinematic"])
         quality_preset = self.QUALITY_PRESETS.get(generation_quality, self.QUALITY_PRESETS["balanced"])
+        # The user's extra style text closes every prompt
+        style_tail = f", {custom_style_prompt}" if custom_style_prompt else ""
+        prompt_seed = seed if seed >= 0 else None
         
         reference_prompts = []
+        ref_characters = [char for char in characters if char.get("refs_needed", 0) > 0]
         
-        for char in characters:
-            refs_needed = char.get("refs_needed", 0)
-            if refs_needed == 0:
-                continue
-            
+        for char in ref_characters:
             name = char["name"]
             desc = char.get("description", f"character named {name}")
+            slug = name.lower().replace(' ', '_')
             
-            views = [
-                ("front", "front view portrait, facing camera, head and shoulders"),
-                ("three_quarter", "three-quarter view portrait, slight turn, head and shoulders"),
-                ("profile", "side profile portrait, head and shoulders")
-            ]
-            
-            for view_name, view_desc in views[:refs_needed]:
-                prompt = f"character portrait of {name}, {desc}, {view_desc}, {style_template}, neutral background, high quality detailed face"
-                if custom_style_prompt:
-                    prompt += f", {custom_style_prompt}"
+            for view_name, view_desc in self.REFERENCE_VIEWS[:char["refs_needed"]]:
+                prompt = f"character portrait of {name}, {desc}, {view_desc}, {style_template}, neutral background, high quality detailed face{style_tail}"
                 
                 reference_prompts.append({
                     "type": "reference",
-                    "id": f"ref_{name.lower().replace(' ', '_')}_{view_name}",
+                    "id": f"ref_{slug}_{view_name}",
                     "character": name,
                     "view": view_name,
                     "prompt": prompt,
                     "negative_prompt": negative_prompt,
                     "width": 1024,
                     "height": 1024,
-                    "seed": seed if seed >= 0 else None
+                    "seed": prompt_seed
                 })
         
         # ===== STEP 4: Generate Story Prompts =====
-        story_prompts = []
         interval = self.DENSITY_INTERVALS.get(image_density, 10)
-        
-        shot_types = [
-            ("establishing", "wide establishing shot showing the environment"),
-            ("medium", "medium shot"),
-            ("close_up", "close-up shot showing emotion"),
-            ("detail", "detail shot of important element"),
-            ("wide", "wide shot showing full scene"),
-            ("over_shoulder", "over-the-shoulder shot"),
-            ("two_shot", "two-shot showing characters together"),
-            ("reaction", "reaction shot capturing expression")
-        ]
-        
-        prompt_idx = 0
-        
-        for scene in scenes:
-            scene_text = scene.get("text", "")
-            scene_word_count = scene.get("word_count", len(scene_text.split()))
-            scene_duration = (scene_word_count / 150) * 60  # seconds
-            images_for_scene = max(1, int(scene_duration / interval))
-            
-            # Find characters in this scene
-            chars_in_scene = []
-            for char in characters:
-                if char["name"].lower() in scene_text.lower():
-                    chars_in_scene.append(char)
-            
-            # Extract scene context
-            scene_snippet = scene_text[:200].replace('\n', ' ')
-            
-            for img_idx in range(images_for_scene):
-                shot_type, shot_desc = shot_types[img_idx % len(shot_types)]
-                
-                # Build character portion
-                char_prompt = ""
-                char_refs_for_prompt = []
-                
-                if chars_in_scene and shot_type not in ["establishing", "detail"]:
-                    # Include character descriptions
-                    char_descs = []
-                    for c in chars_in_scene[:2]:
-                        char_descs.append(f"{c['name']}, {c.get('description', '')}")
-                        if c.get("refs_needed", 0) > 0:
-                            char_refs_for_prompt.append({
-                                "name": c["name"],
-                                "ref_id": f"ref_{c['name'].lower().replace(' ', '_')}_front"
-                            })
-                    char_prompt = f"featuring {' and '.join(char_descs)}"
-                
-                # Build full prompt
-                prompt = f"{shot_desc}, {style_template}, {char_prompt}, scene: {scene_snippet}"
-                if custom_style_prompt:
-                    prompt += f", {custom_style_prompt}"
-                
-                story_prompts.append({
-                    "type": "story",
-                    "id": f"scene_{scene['index']+1:04d}_shot_{img_idx+1:03d}",
-                    "scene_idx": scene["index"],
-                    "shot_idx": img_idx,
-                    "shot_type": shot_type,
-                    "prompt": prompt,
-                    "negative_prompt": negative_prompt,
-                    "width": 1024,
-                    "height": 576,  # 16:9 cinematic
-                    "characters": [c["name"] for c in chars_in_scene],
-                    "character_refs": char_refs_for_prompt,
-                    "seed": seed if seed >= 0 else None
-                })
-                prompt_idx += 1
+        story_stream = self._iter_story_prompts(
+            scenes, characters, interval, style_template, style_tail, negative_prompt, prompt_seed
+        )
         
         # ===== STEP 5: Combine All Prompts =====
-        all_prompts = reference_prompts + story_prompts
-        total_images = len(all_prompts)
-        total_batches = math.ceil(total_images / batch_size)
+        _RECENT_PROMPT_LISTS.clear()
+        # With an output_dir the prompts go to a JSONL file as they are made,
+        # so a long novel's story prompts are never all held in memory
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+            prompts_path = os.path.join(output_dir, "prompts.jsonl")
+            story_count = 0
+            with open(prompts_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                for prompt in reference_prompts:
+                    f.write(_json_dumps(prompt, pretty=False) + '\n')
+                for prompt in story_stream:
+                    f.write(_json_dumps(prompt, pretty=False) + '\n')
+                    story_count += 1
+            total_images = len(reference_prompts) + story_count
+            all_prompts_out = _json_dumps({"path": prompts_path, "start": 0, "count": total_images})
+            story_prompts_out = _json_dumps({"path": prompts_path, "start": len(reference_prompts), "count": story_count})
+        else:
+            story_prompts = list(story_stream)
+            story_count = len(story_prompts)
+            all_prompts = reference_prompts + story_prompts
+            total_images = len(all_prompts)
+            all_prompts_out = _json_dumps(all_prompts, pretty=False)
+            story_prompts_out = _json_dumps(story_prompts, pretty=False)
+            _RECENT_PROMPT_LISTS[all_prompts_out] = all_prompts
+            _RECENT_PROMPT_LISTS[story_prompts_out] = story_prompts
+        total_batches = -(-total_images // batch_size)
         
         # ===== STEP 6: Generation Config =====
+        tier_counts = Counter(c["tier"] for c in characters)
+        main_count = tier_counts["main"]
+        supporting_count = tier_counts["supporting"]
+        minor_count = tier_counts["minor"]
+        
+        steps = quality_preset["steps"]
+        speed = quality_preset["speed"]
+        total_seconds = total_images * speed
+        total_minutes = total_seconds / 60
+        total_hours = total_seconds / 3600
+        
         generation_config = {
             "total_images": total_images,
             "total_reference_images": len(reference_prompts),
-            "total_story_images": len(story_prompts),
+            "total_story_images": story_count,
             "batch_size": batch_size,
             "total_batches": total_batches,
             "quality_preset": generation_quality,
@@ -1115,24 +1533,23 @@ class TurnkeyNovelToImages:
             "interval_seconds": interval,
             
             "estimated_time": {
-                "per_image_seconds": quality_preset["speed"],
-                "total_seconds": total_images * quality_preset["speed"],
-                "total_minutes": (total_images * quality_preset["speed"]) / 60,
-                "total_hours": (total_images * quality_preset["speed"]) / 3600
+                "per_image_seconds": speed,
+                "total_seconds": total_seconds,
+                "total_minutes": total_minutes,
+                "total_hours": total_hours
             },
             
             "character_summary": {
                 "total": len(characters),
-                "main": len([c for c in characters if c["tier"] == "main"]),
-                "supporting": len([c for c in characters if c["tier"] == "supporting"]),
-                "minor": len([c for c in characters if c["tier"] == "minor"]),
-                "with_refs": len([c for c in characters if c.get("refs_needed", 0) > 0])
+                "main": main_count,
+                "supporting": supporting_count,
+                "minor": minor_count,
+                "with_refs": len(ref_characters)
             }
         }
         
         # ===== STEP 7: Full Summary =====
-        est_time = generation_config["estimated_time"]
-        time_str = f"{est_time['total_minutes']:.1f} min" if est_time['total_minutes'] < 60 else f"{est_time['total_hours']:.1f} hrs"
+        time_str = f"{total_minutes:.1f} min" if total_minutes < 60 else f"{total_hours:.1f} hrs"
         
         full_summary = f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -1147,14 +1564,14 @@ class TurnkeyNovelToImages:
 ║  └─ Video Duration:      {video_hours:>12.1f} hours                                  ║
 ║                                                                              ║
 ║  👥 CHARACTERS (Unlimited - Tiered References)                               ║
-║  ├─ Main (⭐ 3 refs):    {generation_config['character_summary']['main']:>12} characters                           ║
-║  ├─ Supporting (🔵 2):   {generation_config['character_summary']['supporting']:>12} characters                           ║
-║  ├─ Minor (⚪ 1 ref):    {generation_config['character_summary']['minor']:>12} characters                           ║
-║  └─ TOTAL:               {generation_config['character_summary']['total']:>12} characters                           ║
+║  ├─ Main (⭐ 3 refs):    {main_count:>12} characters                           ║
+║  ├─ Supporting (🔵 2):   {supporting_count:>12} characters                           ║
+║  ├─ Minor (⚪ 1 ref):    {minor_count:>12} characters                           ║
+║  └─ TOTAL:               {len(characters):>12} characters                           ║
 ║                                                                              ║
 ║  🖼️  IMAGES                                                                   ║
 ║  ├─ Reference Images:    {len(reference_prompts):>12}                                        ║
-║  ├─ Story Images:        {len(story_prompts):>12,}                                        ║
+║  ├─ Story Images:        {story_count:>12,}                                        ║
 ║  ├─ TOTAL:               {total_images:>12,}                                        ║
 ║  └─ Batches:             {total_batches:>12}                                        ║
 ║                                                                              ║
@@ -1162,7 +1579,7 @@ class TurnkeyNovelToImages:
 ║  ├─ Style:               {style:>12}                                        ║
 ║  ├─ Density:             {image_density:>12}                                        ║
 ║  ├─ Quality:             {generation_quality:>12}                                        ║
-║  └─ Steps:               {quality_preset['steps']:>12}                                        ║
+║  └─ Steps:               {steps:>12}                                        ║
 ║                                                                              ║
 ║  ⏱️  ESTIMATED TIME                                                           ║
 ║  └─ Generation:          {time_str:>12}                                        ║
@@ -1177,22 +1594,244 @@ class TurnkeyNovelToImages:
 ╚══════════════════════════════════════════════════════════════════════════════╝
 """
         
+        # The prompt lists that scale with the novel's length are compact:
+        # all_prompts_json (read by the batch/single-prompt nodes) and
+        # story_prompts_json. The short reference list, characters and
+        # config stay indented for reading.
         return (
-            json.dumps(all_prompts, indent=2),
-            json.dumps(reference_prompts, indent=2),
-            json.dumps(story_prompts, indent=2),
-            json.dumps(characters, indent=2),
-            json.dumps(generation_config, indent=2),
+            all_prompts_out,
+            _json_dumps(reference_prompts),
+            story_prompts_out,
+            _json_dumps(characters),
+            _json_dumps(generation_config),
             total_images,
             total_batches,
             full_summary.strip()
         )
+    
+    def _iter_story_prompts(
+        self,
+        scenes: List[Dict],
+        characters: List[Dict],
+        interval: int,
+        style_template: str,
+        style_tail: str,
+        negative_prompt: str,
+        prompt_seed: Optional[int]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the story prompts scene by scene, one per shot"""
+        shot_types = [
+            ("establishing", "wide establishing shot showing the environment"),
+            ("medium", "medium shot"),
+            ("close_up", "close-up shot showing emotion"),
+            ("detail", "detail shot of important element"),
+            ("wide", "wide shot showing full scene"),
+            ("over_shoulder", "over-the-shoulder shot"),
+            ("two_shot", "two-shot showing characters together"),
+            ("reaction", "reaction shot capturing expression")
+        ]
+        # Per shot type: name, the prompt text ahead of the characters, and
+        # whether the scene's featured characters are shown
+        shot_plans = [
+            (shot_type, f"{shot_desc}, {style_template}, ", shot_type not in ["establishing", "detail"])
+            for shot_type, shot_desc in shot_types
+        ]
+        
+        # Character names are matched case-insensitively against each scene
+        find_names = _name_finder([char["name"].lower() for char in characters])
+        
+        # Per-character prompt text and front-view reference, built once
+        # rather than for every shot the character appears in
+        char_labels = [f"{c['name']}, {c.get('description', '')}" for c in characters]
+        char_front_refs = [
+            {"name": c["name"], "ref_id": f"ref_{c['name'].lower().replace(' ', '_')}_front"}
+            if c.get("refs_needed", 0) > 0 else None
+            for c in characters
+        ]
+        
+        # One image per interval of narration at 150 words per minute:
+        # word_count * 60 // (150 * interval) images for a scene
+        shot_divisor = 150 * interval
+        
+        for scene in scenes:
+            scene_idx = scene["index"]
+            scene_text = scene.get("text", "")
+            scene_word_count = scene.get("word_count", len(scene_text.split()))
+            images_for_scene = max(1, scene_word_count * 60 // shot_divisor)
+            
+            # Find characters in this scene; the first two are featured in
+            # the shots that show characters
+            scene_chars = find_names(scene_text.lower())
+            scene_char_names = [characters[idx]["name"] for idx in scene_chars]
+            featured_prompt = f"featuring {' and '.join(char_labels[idx] for idx in scene_chars[:2])}"
+            featured_refs = [char_front_refs[idx] for idx in scene_chars[:2] if char_front_refs[idx]]
+            
+            # Extract scene context
+            scene_snippet = scene_text[:200].replace('\n', ' ')
+            scene_tail = f", scene: {scene_snippet}{style_tail}"
+            id_prefix = f"scene_{scene_idx+1:04d}_shot_"
+            
+            # Shot types repeat in order within each scene
+            for img_idx, (shot_type, prompt_head, shows_chars) in zip(range(images_for_scene), cycle(shot_plans)):
+                
+                # Build character portion
+                char_prompt = ""
+                char_refs_for_prompt = []
+                
+                if scene_chars and shows_chars:
+                    # Include character descriptions
+                    char_prompt = featured_prompt
+                    char_refs_for_prompt = list(featured_refs)
+                
+                # Build full prompt
+                prompt = prompt_head + char_prompt + scene_tail
+                
+                yield {
+                    "type": "story",
+                    "id": f"{id_prefix}{img_idx+1:03d}",
+                    "scene_idx": scene_idx,
+                    "shot_idx": img_idx,
+                    "shot_type": shot_type,
+                    "prompt": prompt,
+                    "negative_prompt": negative_prompt,
+                    "width": 1024,
+                    "height": 576,  # 16:9 cinematic
+                    "characters": list(scene_char_names),
+                    "character_refs": char_refs_for_prompt,
+                    "seed": prompt_seed
+                }
 
 
 # =============================================================================
 # BATCH PROCESSOR - Feeds prompts to sampler
 # =============================================================================
 
+def _load_prompts(prompts_json: str) -> List[Dict[str, Any]]:
+    """Parse a prompt list, or read the one a manifest points to.
+    
+    With an output_dir, TurnkeyNovelToImages returns {"path", "start", "count"}
+    naming a run of lines in its prompts.jsonl instead of the list itself.
+    A string the pipeline just returned maps straight back to its list.
+    """
+    known = _RECENT_PROMPT_LISTS.get(prompts_json)
+    if known is not None:
+        return known
+    data = _json_loads(prompts_json)
+    if isinstance(data, dict) and "path" in data:
+        start = data.get("start", 0)
+        with open(data["path"], encoding='utf-8') as f:
+            return [_json_loads(line) for line in islice(f, start, start + data["count"])]
+    return data
+
+
+_RE_JSON_OBJECT_START = re.compile(r'\s*\{')
+
+# 20-cell progress bars for 0..20 filled cells (5% each)
+_PROGRESS_BARS = tuple("█" * filled + "░" * (20 - filled) for filled in range(21))
+
+
+def _encode_batch(batch: Sequence[Dict[str, Any]]) -> Tuple[str, str, int, int, str]:
+    """Prompts, negatives, width, height and ids outputs for one batch.
+    
+    The dimensions are taken from the first prompt in the batch.
+    """
+    # Extract data in one pass over the batch
+    prompts, negatives, ids = [], [], []
+    for p in batch:
+        prompts.append(p["prompt"])
+        negatives.append(p.get("negative_prompt", ""))
+        ids.append(p["id"])
+    
+    return (
+        _json_dumps(prompts, pretty=False),
+        _json_dumps(negatives, pretty=False),
+        batch[0].get("width", 1024),
+        batch[0].get("height", 1024),
+        _json_dumps(ids, pretty=False)
+    )
+
+
+def _prompts_file_stamp(prompts_json: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of the file a manifest points to, None for a plain list"""
+    # A manifest is a short object; a prompt list starts with '['
+    if not _RE_JSON_OBJECT_START.match(prompts_json):
+        return None
+    data = _json_loads(prompts_json)
+    if isinstance(data, dict) and "path" in data:
+        st = os.stat(data["path"])
+        return st.st_mtime_ns, st.st_size
+    return None
+
+
+@lru_cache(maxsize=4)
+def _ordered_prompts(
+    prompts_json: str,
+    references_first: bool,
+    file_stamp: Optional[Tuple[int, int]] = None
+) -> Tuple[Dict[str, Any], ...]:
+    """Parsed prompts, optionally references then story, cached across calls.
+    
+    A workflow steps batch_index/prompt_index over the same all_prompts_json,
+    so only the first call parses it. The references-first order is built
+    from the cached as-is entry, so the batch and single-prompt nodes wired
+    to the same string share one parse. file_stamp is not read here; being
+    in the cache key, it makes a rewritten prompts.jsonl behind the same
+    manifest be read again. Pass it positionally so the keys line up.
+    """
+    if not references_first:
+        return tuple(_load_prompts(prompts_json))
+    # One pass; prompts of any other type keep their order at the end
+    refs, story, other = [], [], []
+    buckets = {"reference": refs, "story": story}
+    for p in _ordered_prompts(prompts_json, False, file_stamp):
+        buckets.get(p.get("type"), other).append(p)
+    return tuple(refs + story + other)
+
+
+@lru_cache(maxsize=4)
+def _jsonl_line_offsets(path: str, mtime_ns: int, size: int) -> array:
+    """Byte offset of every line of a JSONL file, so one record can be read by seeking.
+    
+    mtime_ns and size are part of the cache key so a rewritten file is
+    indexed again.
+    """
+    offsets = array('q')
+    pos = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            offsets.append(pos)
+            pos += len(line)
+    return offsets
+
+
+def _prompt_at(prompts_json: str, index: int) -> Tuple[Optional[Dict[str, Any]], int]:
+    """The prompt at index (None past the end) and the number of prompts.
+    
+    For a manifest only that one line of prompts.jsonl is read and parsed;
+    the file is never loaded whole. A plain list is parsed once and cached.
+    """
+    if _RE_JSON_OBJECT_START.match(prompts_json):
+        data = _json_loads(prompts_json)
+        if isinstance(data, dict) and "path" in data:
+            total = data["count"]
+            if index >= total:
+                return None, total
+            path = data["path"]
+            st = os.stat(path)
+            offsets = _jsonl_line_offsets(path, st.st_mtime_ns, st.st_size)
+            line_no = data.get("start", 0) + index
+            if line_no >= len(offsets):
+                raise ValueError(f"{path} has fewer prompts than its manifest")
+            with open(path, 'rb') as f:
+                f.seek(offsets[line_no])
+                return _json_loads(f.readline()), total
+    
+    all_prompts = _ordered_prompts(prompts_json, False, None)
+    if index >= len(all_prompts):
+        return None, len(all_prompts)
+    return all_prompts[index], len(all_prompts)
+
+
 class TurnkeyBatchProcessor:
     """
     Processes prompts in batches for the sampler.
@@ -1245,21 +1884,20 @@ class TurnkeyBatchProcessor:
     ) -> Tuple[str, str, int, int, int, int, bool, str, str]:
         
         try:
-            all_prompts = json.loads(all_prompts_json)
-            config = json.loads(generation_config_json)
+            # Optionally sorted references first
+            all_prompts = _ordered_prompts(
+                all_prompts_json,
+                process_references_first,
+                _prompts_file_stamp(all_prompts_json)
+            )
+            config = _json_loads(generation_config_json)
         except:
             return ("[]", "[]", 1024, 1024, 0, 0, False, "Error", "[]")
         
         batch_size = config.get("batch_size", 4)
         
-        # Optionally sort references first
-        if process_references_first:
-            refs = [p for p in all_prompts if p.get("type") == "reference"]
-            story = [p for p in all_prompts if p.get("type") == "story"]
-            all_prompts = refs + story
-        
         total_prompts = len(all_prompts)
-        total_batches = math.ceil(total_prompts / batch_size)
+        total_batches = -(-total_prompts // batch_size)
         
         # Get batch
         start = batch_index * batch_size
@@ -1269,43 +1907,112 @@ class TurnkeyBatchProcessor:
             return ("[]", "[]", 1024, 1024, batch_index, total_batches, False, "Complete!", "[]")
         
         batch = all_prompts[start:end]
+        prompts_out, negatives_out, width, height, ids_out = _encode_batch(batch)
         
-        # Extract data
-        prompts = [p["prompt"] for p in batch]
-        negatives = [p.get("negative_prompt", "") for p in batch]
-        ids = [p["id"] for p in batch]
-        
-        # Use dimensions from first prompt in batch
-        width = batch[0].get("width", 1024)
-        height = batch[0].get("height", 1024)
-        
-        has_more = batch_index < total_batches - 1
+        has_more = end < total_prompts
         
         # Progress
         completed = end
         percent = (completed / total_prompts) * 100
         bar_filled = int(percent / 5)
-        bar = "█" * bar_filled + "░" * (20 - bar_filled)
+        bar = _PROGRESS_BARS[min(bar_filled, 20)]
         
         # Determine what we're processing
-        batch_types = set(p.get("type", "unknown") for p in batch)
-        type_str = "/".join(batch_types)
+        # Distinct types in first-seen order, so the label doesn't depend on
+        # string hashing (e.g. always "reference/story" for a mixed batch)
+        type_str = "/".join(dict.fromkeys(p.get("type", "unknown") for p in batch))
         
         progress_text = f"[{bar}] {percent:.0f}% | Batch {batch_index+1}/{total_batches} | {type_str} | {completed}/{total_prompts} images"
         
         return (
-            json.dumps(prompts),
-            json.dumps(negatives),
+            prompts_out,
+            negatives_out,
             width,
             height,
             batch_index,
             total_batches,
             has_more,
             progress_text,
-            json.dumps(ids)
+            ids_out
         )
 
 
+# =============================================================================
+# ALL BATCHES - Every batch from one node run
+# =============================================================================
+
+class TurnkeyAllBatches:
+    """
+    Emits every batch at once as ComfyUI output lists.
+    """
+    
+    DESCRIPTION = """
+    📦 Turnkey All Batches
+    
+    Same batches as the Batch Processor, from a single run:
+    • One list entry per batch
+    • Downstream nodes run once per batch
+    • No batch_index loop to drive
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "all_prompts_json": ("STRING", {"multiline": True}),
+                "generation_config_json": ("STRING", {"multiline": True}),
+            },
+            "optional": {
+                "process_references_first": ("BOOLEAN", {"default": True}),
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "STRING", "INT", "INT", "STRING", "INT")
+    RETURN_NAMES = (
+        "batch_prompts_json",
+        "batch_negative_json",
+        "batch_width",
+        "batch_height",
+        "batch_ids_json",
+        "total_batches"
+    )
+    OUTPUT_IS_LIST = (True, True, True, True, True, False)
+    FUNCTION = "get_all_batches"
+    CATEGORY = "📚 Novel to Images"
+
+    def get_all_batches(
+        self,
+        all_prompts_json: str,
+        generation_config_json: str,
+        process_references_first: bool = True
+    ) -> Tuple[List[str], List[str], List[int], List[int], List[str], int]:
+        
+        try:
+            all_prompts = _ordered_prompts(
+                all_prompts_json,
+                process_references_first,
+                _prompts_file_stamp(all_prompts_json)
+            )
+            config = _json_loads(generation_config_json)
+        except (OSError, ValueError, TypeError, AttributeError):
+            return ([], [], [], [], [], 0)
+        
+        batch_size = config.get("batch_size", 4) if isinstance(config, dict) else None
+        if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size < 1:
+            return ([], [], [], [], [], 0)
+        
+        # Columns of per-batch outputs, one entry per batch
+        batches = [
+            _encode_batch(all_prompts[start:start + batch_size])
+            for start in range(0, len(all_prompts), batch_size)
+        ]
+        if not batches:
+            return ([], [], [], [], [], 0)
+        prompts_out, negatives_out, widths, heights, ids_out = map(list, zip(*batches))
+        
+        return (prompts_out, negatives_out, widths, heights, ids_out, len(batches))
+
+
 # =============================================================================
 # SINGLE PROMPT EXTRACTOR - For non-batch samplers
 # =============================================================================
@@ -1355,29 +2062,28 @@ class TurnkeySinglePrompt:
     ) -> Tuple[str, str, int, int, str, str, int, bool, str]:
         
         try:
-            all_prompts = json.loads(all_prompts_json)
+            prompt_data, total = _prompt_at(all_prompts_json, prompt_index)
         except:
             return ("", "", 1024, 1024, "", "", 0, False, "Error")
         
-        total = len(all_prompts)
-        
-        if prompt_index >= total:
+        if prompt_data is None:
             return ("", "", 1024, 1024, "", "", total, False, "Complete!")
         
-        prompt_data = all_prompts[prompt_index]
-        
         prompt = prompt_data.get("prompt", "")
         negative = prompt_data.get("negative_prompt", "")
         width = prompt_data.get("width", 1024)
         height = prompt_data.get("height", 1024)
-        image_id = prompt_data.get("id", f"img_{prompt_index}")
+        image_id = prompt_data.get("id")
+        if image_id is None:
+            # Fallback only formatted when there is no id
+            image_id = f"img_{prompt_index}"
         image_type = prompt_data.get("type", "unknown")
         
         has_more = prompt_index < total - 1
         
         percent = ((prompt_index + 1) / total) * 100
         bar_filled = int(percent / 5)
-        bar = "█" * bar_filled + "░" * (20 - bar_filled)
+        bar = _PROGRESS_BARS[min(bar_filled, 20)]
         progress_text = f"[{bar}] {percent:.0f}% | {prompt_index+1}/{total} | {image_type} | {image_id}"
         
         return (
@@ -1447,6 +2153,12 @@ class GPUTimeEstimator:
         "quality": 2.5     # 20-step
     }
     
+    # Seconds per image for every (GPU, quality) pair
+    SECONDS_PER_IMAGE = {
+        (gpu, quality): speed * mult
+        for (gpu, speed), (quality, mult) in product(GPU_SPEEDS.items(), QUALITY_MULTIPLIERS.items())
+    }
+    
     CLOUD_COSTS = {
         "Vast.ai RTX 4090": 0.40,
         "Vast.ai A100": 1.20,
@@ -1455,104 +2167,117 @@ class GPUTimeEstimator:
         "Lambda A100": 1.10,
         "Lambda A100x4": 4.40,
     }
+    
+    # Cloud offering -> (GPU it runs on, number of those GPUs sharing the work)
+    CLOUD_GPUS = {
+        "Vast.ai RTX 4090": ("RTX 4090 24GB", 1),
+        "Vast.ai A100": ("A100 80GB", 1),
+        "RunPod RTX 4090": ("RTX 4090 24GB", 1),
+        "RunPod A100": ("A100 80GB", 1),
+        "Lambda A100": ("A100 80GB", 1),
+        "Lambda A100x4": ("A100 80GB", 4),
+    }
 
     def estimate(
         self,
         total_images: int,
         generation_quality: str
     ) -> Tuple[str]:
-        
-        quality_mult = self.QUALITY_MULTIPLIERS.get(generation_quality, 1.0)
-        
-        estimates = f"""
+        return (self._estimates_text(total_images, generation_quality),)
+    
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _estimates_text(cls, total_images: int, generation_quality: str) -> str:
+        """The estimates banner; it depends only on the two inputs, so it is cached"""
+        # Unknown qualities are estimated at the 1.0x "balanced" speed
+        quality = generation_quality if generation_quality in cls.QUALITY_MULTIPLIERS else "balanced"
+        sec_per_image = cls.SECONDS_PER_IMAGE
+        
+        parts = [f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
 ║                    ⏱️  GPU TIME ESTIMATES FOR {total_images:,} IMAGES                     ║
 ║                         Quality: {generation_quality.upper():^10}                                    ║
 ╠══════════════════════════════════════════════════════════════════════════════╣
 ║                                                                              ║
 ║  💻 CONSUMER GPUs                                                            ║
-"""
+"""]
         
         consumer_gpus = ["RTX 3060 12GB", "RTX 3080 10GB", "RTX 4070 Ti 12GB", "RTX 4090 24GB"]
         for gpu in consumer_gpus:
-            base_speed = self.GPU_SPEEDS[gpu]
-            total_sec = total_images * base_speed * quality_mult
-            time_str = self._format_time(total_sec)
-            estimates += f"║  ├─ {gpu:<18}  {time_str:>12}                              ║\n"
+            total_sec = total_images * sec_per_image[(gpu, quality)]
+            time_str = cls._format_time(total_sec)
+            parts.append(f"║  ├─ {gpu:<18}  {time_str:>12}                              ║\n")
         
-        estimates += """║                                                                              ║
+        parts.append("""║                                                                              ║
 ║  🏢 PROFESSIONAL GPUs                                                        ║
-"""
+""")
         
         pro_gpus = ["A6000 48GB", "A100 80GB", "H100 80GB"]
         for gpu in pro_gpus:
-            base_speed = self.GPU_SPEEDS[gpu]
-            total_sec = total_images * base_speed * quality_mult
-            time_str = self._format_time(total_sec)
-            estimates += f"║  ├─ {gpu:<18}  {time_str:>12}                              ║\n"
+            total_sec = total_images * sec_per_image[(gpu, quality)]
+            time_str = cls._format_time(total_sec)
+            parts.append(f"║  ├─ {gpu:<18}  {time_str:>12}                              ║\n")
         
-        estimates += """║                                                                              ║
+        parts.append("""║                                                                              ║
 ║  🔄 MULTI-GPU (RTX 4090 × N)                                                 ║
-"""
+""")
         
-        base_4090 = self.GPU_SPEEDS["RTX 4090 24GB"]
+        single_4090_sec = total_images * sec_per_image[("RTX 4090 24GB", quality)]
         for num_gpus in [2, 4, 8]:
-            total_sec = (total_images * base_4090 * quality_mult) / num_gpus
-            time_str = self._format_time(total_sec)
-            estimates += f"║  ├─ {num_gpus}× RTX 4090           {time_str:>12}                              ║\n"
+            total_sec = single_4090_sec / num_gpus
+            time_str = cls._format_time(total_sec)
+            parts.append(f"║  ├─ {num_gpus}× RTX 4090           {time_str:>12}                              ║\n")
         
-        estimates += """║                                                                              ║
+        parts.append("""║                                                                              ║
 ╠══════════════════════════════════════════════════════════════════════════════╣
 ║  ☁️  CLOUD RENTAL COSTS                                                       ║
-"""
+""")
         
-        for provider, hourly_cost in self.CLOUD_COSTS.items():
-            if "4090" in provider:
-                speed = self.GPU_SPEEDS["RTX 4090 24GB"]
-            elif "x4" in provider:
-                speed = self.GPU_SPEEDS["A100 80GB"] / 4
-            else:
-                speed = self.GPU_SPEEDS["A100 80GB"]
+        for provider, hourly_cost in cls.CLOUD_COSTS.items():
+            gpu, gpu_count = cls.CLOUD_GPUS.get(provider, ("A100 80GB", 1))
+            speed = sec_per_image[(gpu, quality)] / gpu_count
             
-            total_sec = total_images * speed * quality_mult
+            total_sec = total_images * speed
             hours = total_sec / 3600
             cost = hours * hourly_cost
-            time_str = self._format_time(total_sec)
+            time_str = cls._format_time(total_sec)
             
-            estimates += f"║  ├─ {provider:<20}  {time_str:>10}  ~${cost:>6.2f}                  ║\n"
+            parts.append(f"║  ├─ {provider:<20}  {time_str:>10}  ~${cost:>6.2f}                  ║\n")
         
-        estimates += """║                                                                              ║
+        parts.append("""║                                                                              ║
 ╠══════════════════════════════════════════════════════════════════════════════╣
 ║  💡 RECOMMENDATIONS                                                          ║
 ║                                                                              ║
-"""
+""")
         
         # Add recommendations based on image count
         if total_images < 100:
-            estimates += """║  • Any modern GPU will work fine for this small batch                       ║
+            parts.append("""║  • Any modern GPU will work fine for this small batch                       ║
 ║  • Use "draft" quality for testing, "balanced" for final                    ║
-"""
+""")
         elif total_images < 500:
-            estimates += """║  • RTX 4070 Ti or better recommended                                        ║
+            parts.append("""║  • RTX 4070 Ti or better recommended                                        ║
 ║  • Consider cloud GPU for faster results                                    ║
-"""
+""")
         elif total_images < 2000:
-            estimates += """║  • RTX 4090 recommended for reasonable turnaround                           ║
+            parts.append("""║  • RTX 4090 recommended for reasonable turnaround                           ║
 ║  • Cloud A100 offers best value (~$2-5 total)                               ║
-"""
+""")
         else:
-            estimates += """║  • Multi-GPU or cloud strongly recommended                                  ║
+            parts.append("""║  • Multi-GPU or cloud strongly recommended                                  ║
 ║  • Consider running overnight with checkpoint saves                         ║
 ║  • Best value: Vast.ai A100 (~$2-8 total)                                  ║
-"""
+""")
         
-        estimates += """║                                                                              ║
+        parts.append("""║                                                                              ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
-"""
+""")
         
-        return (estimates.strip(),)
+        return "".join(parts).strip()
     
-    def _format_time(self, seconds: float) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _format_time(seconds: float) -> str:
         if seconds < 60:
             return f"{seconds:.0f} sec"
         elif seconds < 3600:
@@ -1571,6 +2296,7 @@ NODE_CLASS_MAPPINGS = {
     "ImageCalculator": ImageCalculator,
     "TurnkeyNovelToImages": TurnkeyNovelToImages,
     "TurnkeyBatchProcessor": TurnkeyBatchProcessor,
+    "TurnkeyAllBatches": TurnkeyAllBatches,
     "TurnkeySinglePrompt": TurnkeySinglePrompt,
     "GPUTimeEstimator": GPUTimeEstimator,
 }
@@ -1581,6 +2307,7 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "ImageCalculator": "🔢 Image Calculator",
     "TurnkeyNovelToImages": "🚀 Turnkey Novel to Images",
     "TurnkeyBatchProcessor": "⚡ Turnkey Batch Processor",
+    "TurnkeyAllBatches": "📦 Turnkey All Batches",
     "TurnkeySinglePrompt": "🔄 Single Prompt Extractor",
     "GPUTimeEstimator": "⏱️ GPU Time Estimator",
 }
@@ -0,0 +1,29 @@
+"""Checks for the NovelCinematicOrchestrator production plan summary."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from NovelCinematicOrchestrator.orchestrator import NovelCinematicOrchestrator
+
+
+def test_summary_banner_has_no_surrounding_whitespace():
+    config = {
+        'image_engine': 'SDXL',
+        'image_style': 'cinematic',
+        'target_resolution': '1024x576',
+        'parallax_enabled': True,
+        'voice_mode': 'single',
+        'sfx_mode': 'auto',
+        'has_voice_reference': False,
+        'target_video_fps': 24,
+        'scene_transition_style': 'fade',
+        'broll_density': 2,
+    }
+    summary = NovelCinematicOrchestrator()._generate_summary(12, 48, 754.0, 3, config)
+    # The box is followed by the pipeline hints, so check where it closes
+    box = summary.split("\n\n", 1)[0]
+    assert box[0] == "╔"
+    assert box[-1] == "╝"
+    assert summary == summary.strip()